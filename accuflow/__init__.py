@@ -0,0 +1,8 @@
+# Load the Celery app with Django so shared_task binds to it
+try:
+    from .celery import app as celery_app
+except ImportError:
+    # Celery is optional; background tasks then run in the calling process
+    celery_app = None
+
+__all__ = ('celery_app',)
@@ -0,0 +1,17 @@
+"""
+Celery application for accuflow
+
+Reads the CELERY_* settings and registers the tasks modules of the
+installed apps and of the shared ``common`` package.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'accuflow.settings')
+
+app = Celery('accuflow')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+# common is a plain package, not an installed app
+app.autodiscover_tasks(['common'])
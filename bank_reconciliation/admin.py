@@ -1,11 +1,90 @@
 from django.contrib import admin
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, DurationField, ExpressionWrapper, F, Value, When
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import BankAccount, BankStatement, BankTransaction, ReconciliationRule, ReconciliationSession, ReconciliationAdjustment
+from .models import ACCOUNT_FILTER_CACHE_KEY, BankAccount, BankStatement, BankTransaction, ReconciliationRule, ReconciliationSession, ReconciliationAdjustment
+
+
+class ChangeListOnlyMixin:
+    """
+    Restrict change-list queries to the columns the list actually renders.
+
+    Heavy columns such as ``notes`` are only loaded on the change form, which
+    keeps using the full queryset.
+    """
+    list_only_fields = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = getattr(request, 'resolver_match', None)
+        if self.list_only_fields and match and match.url_name and match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.list_only_fields)
+        return queryset
+
+
+class BankAccountFilter(admin.SimpleListFilter):
+    """
+    Filter transactions by bank account.
+
+    The account choices are cached briefly instead of being re-queried on
+    every change-list render.
+    """
+    title = 'bank account'
+    parameter_name = 'account'
+    cache_key = ACCOUNT_FILTER_CACHE_KEY
+    cache_timeout = 300
+
+    def lookups(self, request, model_admin):
+        return cache.get_or_set(
+            self.cache_key,
+            lambda: [
+                (account_id, f"{bank_name} - {name}")
+                for account_id, bank_name, name in BankAccount.objects.order_by(
+                    'bank_name', 'name'
+                ).values_list('id', 'bank_name', 'name')
+            ],
+            self.cache_timeout,
+        )
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(bank_statement__bank_account_id=self.value())
+        return queryset
+
+
+class RecentMonthsFilter(admin.SimpleListFilter):
+    """
+    Limit transactions to recent calendar months.
+
+    Used instead of date_hierarchy, which aggregates over the whole table on
+    every change-list load. This only adds a range predicate on the indexed
+    transaction_date column.
+    """
+    title = 'period'
+    parameter_name = 'months'
+
+    def lookups(self, request, model_admin):
+        return [
+            ('0', 'This month'),
+            ('1', 'Since last month'),
+            ('3', 'Last 3 months'),
+            ('12', 'Last 12 months'),
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() not in {'0', '1', '3', '12'}:
+            return queryset
+        today = timezone.now().date()
+        year, month = divmod(today.year * 12 + today.month - 1 - int(self.value()), 12)
+        return queryset.filter(transaction_date__gte=today.replace(year=year, month=month + 1, day=1))
 
 
 @admin.register(BankAccount)
-class BankAccountAdmin(admin.ModelAdmin):
+class BankAccountAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = ['name', 'bank_name', 'masked_account_number', 'account_type', 'current_balance', 'is_active']
+    list_only_fields = ['name', 'bank_name', 'account_number', 'account_type', 'current_balance', 'is_active']
     list_filter = ['account_type', 'bank_name', 'is_active', 'created_at']
     search_fields = ['name', 'bank_name', 'account_number']
     readonly_fields = ['created_at', 'masked_account_number']
@@ -32,8 +111,13 @@ class BankAccountAdmin(admin.ModelAdmin):
 
 
 @admin.register(BankStatement)
-class BankStatementAdmin(admin.ModelAdmin):
+class BankStatementAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = ['bank_account', 'statement_date', 'beginning_balance', 'ending_balance', 'status']
+    list_select_related = ['bank_account']
+    list_only_fields = [
+        'statement_date', 'beginning_balance', 'ending_balance', 'status',
+        'bank_account__name', 'bank_account__bank_name', 'bank_account__account_number',
+    ]
     list_filter = ['status', 'statement_date', 'bank_account']
     search_fields = ['bank_account__name', 'bank_account__bank_name']
     readonly_fields = ['created_at', 'updated_at']
@@ -57,12 +141,16 @@ class BankStatementAdmin(admin.ModelAdmin):
 
 
 @admin.register(BankTransaction)
-class BankTransactionAdmin(admin.ModelAdmin):
+class BankTransactionAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = ['transaction_date', 'description', 'amount', 'transaction_type', 'bank_statement', 'reconciliation_status']
-    list_filter = ['transaction_type', 'reconciliation_status', 'transaction_date', 'bank_statement__bank_account']
+    list_select_related = ['bank_statement__bank_account']
+    list_only_fields = [
+        'transaction_date', 'description', 'amount', 'transaction_type', 'reconciliation_status',
+        'bank_statement__statement_date', 'bank_statement__bank_account__name',
+    ]
+    list_filter = ['transaction_type', 'reconciliation_status', RecentMonthsFilter, 'transaction_date', BankAccountFilter]
     search_fields = ['description', 'reference_number', 'bank_statement__bank_account__name']
     readonly_fields = ['created_at', 'updated_at']
-    date_hierarchy = 'transaction_date'
     
     fieldsets = (
         ('Transaction Information', {
@@ -83,19 +171,20 @@ class BankTransactionAdmin(admin.ModelAdmin):
     actions = ['mark_as_matched', 'mark_as_cleared']
     
     def mark_as_matched(self, request, queryset):
-        queryset.update(reconciliation_status='matched')
-        self.message_user(request, f"{queryset.count()} transactions marked as matched.")
+        updated = queryset.set_status('matched')
+        self.message_user(request, f"{updated} transactions marked as matched.")
     mark_as_matched.short_description = "Mark selected transactions as matched"
     
     def mark_as_cleared(self, request, queryset):
-        queryset.update(reconciliation_status='cleared')
-        self.message_user(request, f"{queryset.count()} transactions marked as cleared.")
+        updated = queryset.set_status('cleared')
+        self.message_user(request, f"{updated} transactions marked as cleared.")
     mark_as_cleared.short_description = "Mark selected transactions as cleared"
 
 
 @admin.register(ReconciliationRule)
-class ReconciliationRuleAdmin(admin.ModelAdmin):
+class ReconciliationRuleAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = ['name', 'rule_type', 'is_active', 'auto_match', 'confidence_threshold']
+    list_only_fields = ['name', 'rule_type', 'is_active', 'auto_match', 'confidence_threshold']
     list_filter = ['rule_type', 'is_active', 'auto_match', 'created_at']
     search_fields = ['name', 'description_pattern']
     readonly_fields = ['created_at']
@@ -115,11 +204,16 @@ class ReconciliationRuleAdmin(admin.ModelAdmin):
 
 
 @admin.register(ReconciliationSession)
-class ReconciliationSessionAdmin(admin.ModelAdmin):
-    list_display = ['session_name', 'bank_account', 'start_date', 'status', 'difference', 'is_balanced']
+class ReconciliationSessionAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
+    list_display = ['session_name', 'bank_account', 'start_date', 'status', 'difference', 'is_balanced', 'duration']
+    list_select_related = ['bank_account']
+    list_only_fields = [
+        'session_name', 'start_date', 'status', 'difference',
+        'bank_account__name', 'bank_account__bank_name', 'bank_account__account_number',
+    ]
     list_filter = ['status', 'start_date', 'bank_account']
     search_fields = ['session_name', 'bank_account__name']
-    readonly_fields = ['created_at', 'updated_at', 'is_balanced']
+    readonly_fields = ['start_date', 'created_at', 'updated_at', 'is_balanced']
     date_hierarchy = 'start_date'
     
     fieldsets = (
@@ -141,15 +235,41 @@ class ReconciliationSessionAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # Computed in SQL so the change list does not evaluate model properties per row
+        return super().get_queryset(request).annotate(
+            _is_balanced=Case(
+                When(difference=0, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            _duration=ExpressionWrapper(
+                Coalesce('end_date', Now()) - F('start_date'),
+                output_field=DurationField(),
+            ),
+        )
+    
     def is_balanced(self, obj):
-        return obj.is_balanced
+        return obj._is_balanced
     is_balanced.boolean = True
     is_balanced.short_description = 'Balanced'
+    is_balanced.admin_order_field = '_is_balanced'
+    
+    def duration(self, obj):
+        return obj._duration
+    duration.short_description = 'Duration'
+    duration.admin_order_field = '_duration'
 
 
 @admin.register(ReconciliationAdjustment)
-class ReconciliationAdjustmentAdmin(admin.ModelAdmin):
+class ReconciliationAdjustmentAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = ['reconciliation_session', 'adjustment_type', 'description', 'amount', 'affects_book_balance', 'affects_bank_balance']
+    list_select_related = ['reconciliation_session__bank_account']
+    list_only_fields = [
+        'adjustment_type', 'description', 'amount', 'affects_book_balance', 'affects_bank_balance',
+        'reconciliation_session__session_name', 'reconciliation_session__start_date',
+        'reconciliation_session__bank_account__name',
+    ]
     list_filter = ['adjustment_type', 'affects_book_balance', 'affects_bank_balance', 'created_at']
     search_fields = ['description', 'reconciliation_session__session_name']
     readonly_fields = ['created_at']
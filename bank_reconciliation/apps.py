@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BankReconciliationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "bank_reconciliation"
+
+    def ready(self):
+        import bank_reconciliation.signals  # Import signals to register them
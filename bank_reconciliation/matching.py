@@ -0,0 +1,180 @@
+"""
+Rule evaluation for automatic bank reconciliation.
+
+Transactions are evaluated against all rules at once: every (transaction,
+rule) pair becomes a cell in a boolean matrix and the first firing rule per
+transaction decides the outcome, mirroring the order in which rules are
+listed. Reference-number rules are exact keys, so their cells are filled
+with a dictionary lookup on each transaction's reference instead of a scan.
+
+A rule set is compiled once into plain closures (patterns lower-cased,
+amount bounds converted to cents, confidence gates resolved) and reused for
+as long as the active rules are unchanged. Description patterns are packed
+into a single Aho-Corasick automaton when pyahocorasick is installed, so each
+description is scanned once regardless of how many rules there are.
+"""
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from .models import to_cents
+
+REFERENCE_CONFIDENCE = 100
+DESCRIPTION_CONFIDENCE = 90
+AMOUNT_CONFIDENCE = 95
+
+CompiledRules = namedtuple(
+    'CompiledRules', ['references', 'columns', 'scan_descriptions', 'auto_match']
+)
+
+
+def _description_matcher(pattern):
+    """Column builder: the pattern occurs in the (lower-cased) description."""
+    def column(cents, descriptions):
+        return np.fromiter(
+            (pattern in description for description in descriptions),
+            dtype=bool,
+            count=len(descriptions),
+        )
+    return column
+
+
+def _description_scanner(patterns):
+    """
+    Build a function that marks every (description, rule) hit in ``fires``.
+
+    Args:
+        patterns: Mapping of lower-cased pattern -> rule column indexes
+    """
+    if not patterns:
+        return None
+
+    if ahocorasick is None or '' in patterns:
+        # Without the automaton (or with an empty pattern, which always matches)
+        # fall back to one substring scan per pattern
+        matchers = [
+            (np.array(columns), _description_matcher(pattern))
+            for pattern, columns in patterns.items()
+        ]
+
+        def scan(descriptions, fires):
+            for columns, matcher in matchers:
+                fires[:, columns] |= matcher(None, descriptions)[:, None]
+        return scan
+
+    automaton = ahocorasick.Automaton()
+    for pattern, columns in patterns.items():
+        automaton.add_word(pattern, np.array(columns))
+    automaton.make_automaton()
+
+    def scan(descriptions, fires):
+        for i, description in enumerate(descriptions):
+            for _end, columns in automaton.iter(description):
+                fires[i, columns] = True
+    return scan
+
+
+def _amount_matcher(amount_min, amount_max):
+    """Column builder: the amount in cents falls inside [amount_min, amount_max]."""
+    if amount_min is None or amount_max is None:
+        return None
+
+    def column(cents, descriptions):
+        return (cents >= amount_min) & (cents <= amount_max)
+    return column
+
+
+def _rule_signature(rule):
+    """Everything about a rule that affects matching, as a hashable tuple."""
+    return (
+        rule.pk, rule.rule_type, rule.description_pattern, rule.amount_min,
+        rule.amount_max, rule.reference_pattern, rule.confidence_threshold,
+        rule.auto_match,
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile(signature):
+    references = {}
+    description_patterns = defaultdict(list)
+    columns = []
+    auto_match = []
+    for (_pk, rule_type, description_pattern, amount_min, amount_max,
+         reference_pattern, confidence_threshold, rule_auto_match) in signature:
+        column = None
+        if rule_type == 'reference_number':
+            if reference_pattern and REFERENCE_CONFIDENCE >= confidence_threshold:
+                references.setdefault(reference_pattern, []).append(len(columns))
+        elif rule_type == 'description_contains':
+            if DESCRIPTION_CONFIDENCE >= confidence_threshold:
+                description_patterns[description_pattern.lower()].append(len(columns))
+        elif rule_type == 'amount_exact':
+            if AMOUNT_CONFIDENCE >= confidence_threshold:
+                column = _amount_matcher(to_cents(amount_min), to_cents(amount_max))
+        # Add more rule types as needed
+
+        columns.append(column)
+        auto_match.append(rule_auto_match)
+    return CompiledRules(
+        {reference: np.array(indexes) for reference, indexes in references.items()},
+        tuple(columns),
+        _description_scanner(description_patterns),
+        np.array(auto_match, dtype=bool),
+    )
+
+
+def compile_rules(rules):
+    """Return the compiled matcher for ``rules``, cached on the rules' contents."""
+    return _compile(tuple(_rule_signature(rule) for rule in rules))
+
+
+def _mark_references(references, rows, fires):
+    """Mark the reference-number rules whose pattern equals each transaction's reference."""
+    if not references:
+        return
+    for i, row in enumerate(rows):
+        columns = references.get(row[4]) if row[4] else None
+        if columns is not None:
+            fires[i, columns] = True
+
+
+def match_transactions(rules, rows):
+    """
+    Return the ids of transactions that should be auto-matched.
+
+    Args:
+        rules: Active ReconciliationRule instances, in evaluation order
+        rows: (id, cents, status, description, reference_number) tuples from
+            ``as_cents('description', 'reference_number')``
+
+    Returns:
+        list: Transaction ids whose first firing rule has auto_match enabled
+    """
+    compiled = compile_rules(rules)
+    rows = list(rows)
+    if not rows or not compiled.columns:
+        return []
+
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    cents = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    descriptions = [row[3].lower() for row in rows]
+
+    # fires[i, j] is True when rule j reaches its confidence threshold for transaction i
+    fires = np.zeros((len(rows), len(compiled.columns)), dtype=bool)
+    for j, column in enumerate(compiled.columns):
+        if column is not None:
+            fires[:, j] = column(cents, descriptions)
+    if compiled.scan_descriptions is not None:
+        compiled.scan_descriptions(descriptions, fires)
+    _mark_references(compiled.references, rows, fires)
+
+    # Only the first firing rule counts; it matches when that rule allows auto-matching
+    first_rule = fires.argmax(axis=1)
+    matched = fires.any(axis=1) & compiled.auto_match[first_rule]
+    return ids[matched].tolist()
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_reconciliation', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bankaccount',
+            name='account_number',
+            field=models.CharField(max_length=50),
+        ),
+        migrations.AddConstraint(
+            model_name='bankaccount',
+            constraint=models.UniqueConstraint(models.Case(models.When(is_active=True, then=models.F('account_number'))), name='uniq_active_account_number', violation_error_message='An active bank account with this account number already exists.'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_reconciliation', '0002_bankaccount_active_account_number'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banktransaction',
+            name='sign',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(amount__lt=0, then=models.Value(-1)), models.When(amount__gt=0, then=models.Value(1)), default=models.Value(0)), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(fields=['sign'], name='bank_reconc_sign_4670d3_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_reconciliation', '0003_banktransaction_sign'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(condition=models.Q(('reconciliation_status', 'unreconciled')), fields=['id'], name='br_tx_unrec_idx'),
+        ),
+    ]
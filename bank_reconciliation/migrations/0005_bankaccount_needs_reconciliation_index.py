@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_reconciliation', '0004_banktransaction_unreconciled_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bankaccount',
+            index=models.Index(fields=['is_active', 'last_reconciled_date'], name='br_acct_needs_recon_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_reconciliation', '0005_bankaccount_needs_reconciliation_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(fields=['bank_statement', 'reconciliation_status', '-transaction_date'], name='br_tx_stmt_stat_date_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.functions import Cast, Round
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from django.utils import timezone
@@ -7,6 +10,12 @@ from django.utils import timezone
 User = get_user_model()
 
 
+def to_cents(amount):
+    """Convert a Decimal amount to an integer number of cents."""
+    if amount is None:
+        return None
+    return int((Decimal(amount) * 100).to_integral_value())
+
 class BankAccount(models.Model):
     """
     Model representing a bank account for reconciliation.
@@ -21,7 +30,7 @@ class BankAccount(models.Model):
     ]
     
     name = models.CharField(max_length=200)
-    account_number = models.CharField(max_length=50, unique=True)
+    account_number = models.CharField(max_length=50)
     account_type = models.CharField(max_length=20, choices=ACCOUNT_TYPES, default='checking')
     bank_name = models.CharField(max_length=200)
     routing_number = models.CharField(max_length=20, blank=True)
@@ -38,6 +47,19 @@ class BankAccount(models.Model):
         verbose_name = 'Bank Account'
         verbose_name_plural = 'Bank Accounts'
         ordering = ['bank_name', 'name']
+        indexes = [
+            models.Index(fields=['is_active', 'last_reconciled_date'], name='br_acct_needs_recon_idx'),
+        ]
+        constraints = [
+            # Only active accounts need unique numbers. Inactive rows index as
+            # NULL, which never collides, so this works without partial index
+            # support (e.g. MySQL) as well.
+            models.UniqueConstraint(
+                Case(When(is_active=True, then=F('account_number'))),
+                name='uniq_active_account_number',
+                violation_error_message='An active bank account with this account number already exists.',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.bank_name} - {self.name} ({self.account_number[-4:]})"
@@ -99,6 +121,46 @@ class BankStatement(models.Model):
         return self.transactions.filter(reconciliation_status='unreconciled').count()
 
 
+class BankTransactionQuerySet(models.QuerySet):
+    """QuerySet helpers for bank transactions."""
+    
+    def as_cents(self, *fields):
+        """
+        Return (id, cents, reconciliation_status, *fields) tuples with the amount
+        as integer cents, so matching and summing can stay in plain int arithmetic.
+        """
+        return self.annotate(
+            cents=Cast(Round(F('amount') * 100), models.BigIntegerField())
+        ).values_list('id', 'cents', 'reconciliation_status', *fields)
+    
+    def set_status(self, status, **fields):
+        """
+        Bulk-update reconciliation_status and keep the counters of open
+        reconciliation sessions in step, since update() skips model signals.
+        
+        Returns:
+            int: Number of rows updated
+        """
+        changes = list(
+            self.exclude(reconciliation_status=status)
+            .order_by()
+            .values_list('bank_statement_id', 'reconciliation_status')
+            .annotate(count=Count('id'))
+        )
+        updated = self.update(reconciliation_status=status, **fields)
+        for statement_id, old_status, count in changes:
+            adjust_session_counters(statement_id, old_status, status, count)
+        return updated
+    
+    def debits(self):
+        """Transactions with a negative amount, filtered on the indexed sign column."""
+        return self.filter(sign=-1)
+    
+    def credits(self):
+        """Transactions with a positive amount, filtered on the indexed sign column."""
+        return self.filter(sign=1)
+
+
 class BankTransaction(models.Model):
     """
     Model representing individual bank transactions from statements.
@@ -125,11 +187,24 @@ class BankTransaction(models.Model):
         ('void', 'Void'),
     ]
     
+    # Label lookups built once; get_FOO_display() rebuilds a dict on every call
+    TRANSACTION_TYPE_LABELS = dict(TRANSACTION_TYPES)
+    RECONCILIATION_STATUS_LABELS = dict(RECONCILIATION_STATUS)
+    
     bank_statement = models.ForeignKey(BankStatement, on_delete=models.CASCADE, related_name='transactions')
     transaction_date = models.DateField()
     description = models.CharField(max_length=500)
     transaction_type = models.CharField(max_length=20, choices=TRANSACTION_TYPES)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
+    sign = models.GeneratedField(
+        expression=Case(
+            When(amount__lt=0, then=Value(-1)),
+            When(amount__gt=0, then=Value(1)),
+            default=Value(0),
+        ),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
     running_balance = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     check_number = models.CharField(max_length=20, blank=True)
     reference_number = models.CharField(max_length=100, blank=True)
@@ -140,6 +215,8 @@ class BankTransaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = BankTransactionQuerySet.as_manager()
+    
     class Meta:
         db_table = 'bank_reconciliation_banktransaction'
         verbose_name = 'Bank Transaction'
@@ -149,11 +226,31 @@ class BankTransaction(models.Model):
             models.Index(fields=['transaction_date']),
             models.Index(fields=['reconciliation_status']),
             models.Index(fields=['amount']),
+            models.Index(fields=['sign']),
+            # Serves a statement's transactions filtered by status, newest first
+            models.Index(
+                fields=['bank_statement', 'reconciliation_status', '-transaction_date'],
+                name='br_tx_stmt_stat_date_idx',
+            ),
+            # Small index covering only the rows still waiting to be reconciled
+            models.Index(
+                fields=['id'],
+                condition=models.Q(reconciliation_status='unreconciled'),
+                name='br_tx_unrec_idx',
+            ),
         ]
     
     def __str__(self):
         return f"{self.transaction_date} - {self.description[:50]} - GH₵{self.amount}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored status, so a later save can tell whether it changed without
+        # re-reading the row; None when the field was deferred
+        instance._loaded_reconciliation_status = instance.__dict__.get('reconciliation_status')
+        return instance
+    
     @property
     def is_debit(self):
         """Return True if transaction is a debit (negative amount)."""
@@ -254,6 +351,52 @@ class ReconciliationSession(models.Model):
         return self.difference == 0
 
 
+MATCHED_STATUSES = ('matched', 'cleared')
+UNMATCHED_STATUSES = ('unreconciled',)
+
+
+def adjust_session_counters(statement_id, old_status, new_status, count=1):
+    """
+    Apply a reconciliation status transition to the matched/unmatched counters
+    of the statement's open reconciliation sessions with a single F() update.
+    
+    ``old_status`` is None for newly created transactions and ``new_status`` is
+    None for deleted ones.
+    """
+    matched_delta = count * ((new_status in MATCHED_STATUSES) - (old_status in MATCHED_STATUSES))
+    unmatched_delta = count * ((new_status in UNMATCHED_STATUSES) - (old_status in UNMATCHED_STATUSES))
+    if not matched_delta and not unmatched_delta:
+        return
+    ReconciliationSession.objects.filter(
+        bank_statement_id=statement_id,
+        status__in=['in_progress', 'paused'],
+    ).update(
+        transactions_matched=F('transactions_matched') + matched_delta,
+        transactions_unmatched=F('transactions_unmatched') + unmatched_delta,
+    )
+
+
+ACTIVE_ACCOUNTS_CACHE_KEY = 'br:active_accounts'
+ACTIVE_ACCOUNTS_CACHE_TIMEOUT = 300
+
+# Account choices of the admin's BankAccountFilter
+ACCOUNT_FILTER_CACHE_KEY = 'br:bank_account_filter'
+
+
+def get_active_accounts():
+    """
+    Return the active bank accounts ordered by bank and name.
+    
+    Accounts change rarely but are listed on every reconciliation page, so the
+    list is cached and dropped by the BankAccount save/delete signals.
+    """
+    return cache.get_or_set(
+        ACTIVE_ACCOUNTS_CACHE_KEY,
+        lambda: list(BankAccount.objects.filter(is_active=True).order_by('bank_name', 'name')),
+        ACTIVE_ACCOUNTS_CACHE_TIMEOUT,
+    )
+
+
 class ReconciliationAdjustment(models.Model):
     """
     Model for tracking adjustments made during reconciliation.
@@ -0,0 +1,57 @@
+"""
+Django signals for bank reconciliation
+Keeps reconciliation session counters in step with transaction status changes
+and drops cached bank account lists when accounts change
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    ACCOUNT_FILTER_CACHE_KEY, ACTIVE_ACCOUNTS_CACHE_KEY, BankAccount, BankTransaction,
+    adjust_session_counters
+)
+
+
+@receiver(pre_save, sender=BankTransaction)
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    """
+    Look up the stored status only for existing rows that were not loaded
+    with it (deferred field or an instance built by hand); rows loaded from
+    the database already carry it from BankTransaction.from_db().
+    """
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and 'reconciliation_status' not in update_fields:
+        return
+    if getattr(instance, '_loaded_reconciliation_status', None) is None:
+        instance._loaded_reconciliation_status = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('reconciliation_status', flat=True).first()
+
+
+@receiver(post_save, sender=BankTransaction)
+def update_session_counters_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Increment/decrement session counters when the status changes."""
+    if update_fields is not None and 'reconciliation_status' not in update_fields:
+        return
+    previous_status = None if created else instance._loaded_reconciliation_status
+    if previous_status != instance.reconciliation_status:
+        adjust_session_counters(
+            instance.bank_statement_id, previous_status, instance.reconciliation_status
+        )
+    # The saved status is now the stored one
+    instance._loaded_reconciliation_status = instance.reconciliation_status
+
+
+@receiver(post_delete, sender=BankTransaction)
+def update_session_counters_on_delete(sender, instance, **kwargs):
+    """Remove a deleted transaction from the session counters."""
+    adjust_session_counters(instance.bank_statement_id, instance.reconciliation_status, None)
+
+
+@receiver(post_save, sender=BankAccount)
+@receiver(post_delete, sender=BankAccount)
+def invalidate_account_caches(sender, instance, **kwargs):
+    """Forget the cached account lists so the next request reloads them."""
+    cache.delete_many([ACTIVE_ACCOUNTS_CACHE_KEY, ACCOUNT_FILTER_CACHE_KEY])
@@ -1,4 +1,242 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+
+from .matching import match_transactions
+from .models import (
+    BankAccount, BankStatement, BankTransaction, ReconciliationRule, ReconciliationSession,
+    adjust_session_counters
+)
+from .views import BankTransactionListView, ReconciliationSessionListView
+
+User = get_user_model()
 
 # Tests for bank reconciliation functionality
-# Add test cases here as needed
+
+
+class ReconciliationTestMixin:
+    """Creates an account, a statement and an open session on that statement."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reconciler', password='test123')
+        cls.account = BankAccount.objects.create(
+            name='Operating', account_number='1001', bank_name='GCB', created_by=cls.user
+        )
+        cls.statement = BankStatement.objects.create(
+            bank_account=cls.account,
+            statement_date=date(2024, 1, 31),
+            beginning_balance=Decimal('0.00'),
+            ending_balance=Decimal('100.00'),
+            statement_period_start=date(2024, 1, 1),
+            statement_period_end=date(2024, 1, 31),
+        )
+
+    def setUp(self):
+        self.session = ReconciliationSession.objects.create(
+            bank_account=self.account,
+            bank_statement=self.statement,
+            session_name='January',
+            starting_book_balance=Decimal('0.00'),
+            statement_balance=Decimal('100.00'),
+            reconciled_by=self.user,
+        )
+
+    def create_transaction(self, amount='10.00', description='Deposit', reference='', **kwargs):
+        return BankTransaction.objects.create(
+            bank_statement=self.statement,
+            transaction_date=date(2024, 1, 15),
+            description=description,
+            transaction_type='deposit',
+            amount=Decimal(amount),
+            reference_number=reference,
+            **kwargs
+        )
+
+    def assertCounters(self, matched, unmatched):
+        self.session.refresh_from_db()
+        self.assertEqual(
+            (self.session.transactions_matched, self.session.transactions_unmatched),
+            (matched, unmatched),
+        )
+
+
+class SessionCounterTests(ReconciliationTestMixin, TestCase):
+    """Session counters follow transaction status changes without recounting."""
+
+    def test_created_transactions_count_as_unmatched(self):
+        self.create_transaction()
+        self.create_transaction(reconciliation_status='matched')
+        self.assertCounters(matched=1, unmatched=1)
+
+    def test_status_change_on_save_moves_the_counters(self):
+        transaction = self.create_transaction()
+        transaction.reconciliation_status = 'matched'
+        transaction.save()
+        self.assertCounters(matched=1, unmatched=0)
+
+    def test_save_of_loaded_row_does_not_reread_the_status(self):
+        transaction = BankTransaction.objects.get(pk=self.create_transaction().pk)
+        transaction.reconciliation_status = 'cleared'
+        # Only the UPDATE of the row and the counter update
+        with self.assertNumQueries(2):
+            transaction.save()
+        self.assertCounters(matched=1, unmatched=0)
+
+    def test_save_without_status_change_leaves_counters_alone(self):
+        transaction = self.create_transaction()
+        transaction.notes = 'Checked'
+        with self.assertNumQueries(1):
+            transaction.save()
+        self.assertCounters(matched=0, unmatched=1)
+
+    def test_update_fields_without_status_is_ignored(self):
+        transaction = self.create_transaction()
+        transaction.reconciliation_status = 'matched'
+        transaction.save(update_fields=['notes'])
+        self.assertCounters(matched=0, unmatched=1)
+
+    def test_repeated_saves_count_a_change_once(self):
+        transaction = self.create_transaction()
+        transaction.reconciliation_status = 'matched'
+        transaction.save()
+        transaction.save()
+        self.assertCounters(matched=1, unmatched=0)
+
+    def test_deferred_status_is_read_before_saving(self):
+        transaction = BankTransaction.objects.defer('reconciliation_status').get(
+            pk=self.create_transaction().pk
+        )
+        transaction.reconciliation_status = 'matched'
+        transaction.save()
+        self.assertCounters(matched=1, unmatched=0)
+
+    def test_delete_removes_the_transaction_from_the_counters(self):
+        self.create_transaction().delete()
+        self.create_transaction(reconciliation_status='matched').delete()
+        self.assertCounters(matched=0, unmatched=0)
+
+    def test_set_status_applies_grouped_deltas(self):
+        self.create_transaction()
+        self.create_transaction()
+        self.create_transaction(reconciliation_status='matched')
+        self.create_transaction(reconciliation_status='disputed')
+
+        updated = BankTransaction.objects.filter(bank_statement=self.statement).set_status('cleared')
+
+        self.assertEqual(updated, 4)
+        # The already matched row moves between matched statuses; the disputed
+        # row was in neither counter
+        self.assertCounters(matched=4, unmatched=0)
+
+    def test_set_status_to_current_status_is_a_no_op(self):
+        self.create_transaction(reconciliation_status='matched')
+        BankTransaction.objects.all().set_status('matched')
+        self.assertCounters(matched=1, unmatched=0)
+
+    def test_closed_sessions_are_not_adjusted(self):
+        self.session.status = 'completed'
+        self.session.save()
+        self.create_transaction()
+        self.assertCounters(matched=0, unmatched=0)
+
+    def test_adjust_session_counters_deltas(self):
+        adjust_session_counters(self.statement.pk, None, 'unreconciled', count=3)
+        self.assertCounters(matched=0, unmatched=3)
+        adjust_session_counters(self.statement.pk, 'unreconciled', 'matched', count=2)
+        self.assertCounters(matched=2, unmatched=1)
+        adjust_session_counters(self.statement.pk, 'matched', 'cleared', count=2)
+        self.assertCounters(matched=2, unmatched=1)
+        adjust_session_counters(self.statement.pk, 'cleared', None)
+        self.assertCounters(matched=1, unmatched=1)
+
+
+class MatchTransactionsTests(ReconciliationTestMixin, TestCase):
+    """The first firing rule, in list order, decides whether a transaction matches."""
+
+    def rule(self, name, rule_type, auto_match=True, confidence_threshold=80, **kwargs):
+        return ReconciliationRule.objects.create(
+            name=name, rule_type=rule_type, auto_match=auto_match,
+            confidence_threshold=confidence_threshold, created_by=self.user, **kwargs
+        )
+
+    def match(self, rules):
+        rows = BankTransaction.objects.order_by('pk').as_cents('description', 'reference_number')
+        return match_transactions(rules, rows)
+
+    def test_each_rule_type_matches(self):
+        by_reference = self.create_transaction(reference='REF-1')
+        by_description = self.create_transaction(description='MTN MoMo transfer')
+        by_amount = self.create_transaction(amount='42.50')
+        self.create_transaction(amount='7.00', description='Unrelated')
+        rules = [
+            self.rule('Reference', 'reference_number', reference_pattern='REF-1'),
+            self.rule('Description', 'description_contains', description_pattern='momo'),
+            self.rule('Amount', 'amount_exact', amount_min=Decimal('42.50'), amount_max=Decimal('42.50')),
+        ]
+        self.assertEqual(
+            sorted(self.match(rules)),
+            sorted([by_reference.pk, by_description.pk, by_amount.pk]),
+        )
+
+    def test_earlier_rule_without_auto_match_wins(self):
+        transaction = self.create_transaction(description='Bank charges', reference='REF-2')
+        review_first = [
+            self.rule('Review charges', 'description_contains', auto_match=False,
+                      description_pattern='charges'),
+            self.rule('Reference', 'reference_number', reference_pattern='REF-2'),
+        ]
+        self.assertEqual(self.match(review_first), [])
+        self.assertEqual(self.match(review_first[::-1]), [transaction.pk])
+
+    def test_reference_rule_takes_its_place_in_list_order(self):
+        transaction = self.create_transaction(amount='15.00', reference='REF-3')
+        rules = [
+            self.rule('Amount', 'amount_exact', amount_min=Decimal('10.00'), amount_max=Decimal('20.00')),
+            self.rule('Hold reference', 'reference_number', auto_match=False, reference_pattern='REF-3'),
+        ]
+        self.assertEqual(self.match(rules), [transaction.pk])
+        self.assertEqual(self.match(rules[::-1]), [])
+
+    def test_rules_below_their_confidence_threshold_never_fire(self):
+        transaction = self.create_transaction(description='Salary payment')
+        rules = [
+            self.rule('Strict', 'description_contains', auto_match=False,
+                      confidence_threshold=95, description_pattern='salary'),
+            self.rule('Salary', 'description_contains', description_pattern='salary'),
+        ]
+        self.assertEqual(self.match(rules), [transaction.pk])
+
+    def test_no_rules_or_rows_match_nothing(self):
+        self.assertEqual(self.match([]), [])
+        rule = self.rule('Reference', 'reference_number', reference_pattern='REF-4')
+        self.assertEqual(self.match([rule]), [])
+
+
+class ListViewColumnTests(ReconciliationTestMixin, TestCase):
+    """List pages load only their columns and need no per-row queries."""
+
+    def get_queryset(self, view_class):
+        view = view_class()
+        view.setup(RequestFactory().get('/'))
+        return view.get_queryset()
+
+    def test_transaction_list_defers_unlisted_columns(self):
+        self.create_transaction(notes='Internal note')
+        with self.assertNumQueries(1):
+            transaction = list(self.get_queryset(BankTransactionListView))[0]
+            str(transaction)
+            str(transaction.bank_statement.bank_account)
+            transaction.get_reconciliation_status_display()
+        self.assertIn('notes', transaction.get_deferred_fields())
+
+    def test_session_list_defers_unlisted_columns(self):
+        with self.assertNumQueries(1):
+            session = list(self.get_queryset(ReconciliationSessionListView))[0]
+            str(session)
+            str(session.bank_account)
+            session.bank_statement.statement_date
+            session.reconciled_by.get_full_name()
+        self.assertIn('notes', session.get_deferred_fields())
@@ -1,20 +1,79 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.contrib import messages
 from django.urls import reverse_lazy
-from django.db.models import Sum, Count, Q
-from django.http import JsonResponse, HttpResponse
+from django.db import transaction
+from django.db.models import Sum, Count, Q, F, Prefetch, OuterRef, Subquery, DecimalField
+from django.db.models.functions import Coalesce
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.views.decorators.cache import cache_control
 from datetime import datetime, timedelta
 from decimal import Decimal
 import csv
+import io
 
 from .models import (
     BankAccount, BankStatement, BankTransaction,
-    ReconciliationRule, ReconciliationSession
+    ReconciliationRule, ReconciliationSession, ACTIVE_ACCOUNTS_CACHE_KEY,
+    adjust_session_counters, get_active_accounts
 )
+from .matching import match_transactions
+from common.pagination import EstimatedCountPaginator, estimated_query_count
+from common.utils import Echo
+
+
+UNRECONCILED_COUNT_TTL = 30
+
+ACCOUNTS_NEEDING_RECONCILIATION_LIMIT = 20
+
+OPEN_STATEMENT_STATUSES = ['imported', 'processing', 'partially_reconciled']
+
+# Columns each list page renders, for QuerySet.only(); notes and the other
+# unused columns of the joined rows are never loaded
+STATEMENT_LIST_FIELDS = (
+    'id', 'statement_date', 'beginning_balance', 'ending_balance',
+    'statement_period_start', 'statement_period_end', 'status', 'reconciliation_date',
+    'bank_account__id', 'bank_account__name', 'bank_account__bank_name',
+    'bank_account__account_number',
+    'reconciled_by__id', 'reconciled_by__username',
+    'reconciled_by__first_name', 'reconciled_by__last_name',
+)
+
+TRANSACTION_LIST_FIELDS = (
+    'id', 'transaction_date', 'description', 'amount', 'transaction_type',
+    'reconciliation_status', 'check_number', 'reference_number',
+    'bank_statement__id', 'bank_statement__statement_date',
+    'bank_statement__bank_account__id', 'bank_statement__bank_account__name',
+    'bank_statement__bank_account__bank_name', 'bank_statement__bank_account__account_number',
+    'reconciled_by__id', 'reconciled_by__username',
+    'reconciled_by__first_name', 'reconciled_by__last_name',
+)
+
+SESSION_LIST_FIELDS = (
+    'id', 'session_name', 'start_date', 'end_date', 'status', 'starting_book_balance',
+    'ending_book_balance', 'statement_balance', 'difference',
+    'transactions_matched', 'transactions_unmatched',
+    'bank_account__id', 'bank_account__name', 'bank_account__bank_name',
+    'bank_account__account_number',
+    'bank_statement__id', 'bank_statement__statement_date',
+    'reconciled_by__id', 'reconciled_by__username',
+    'reconciled_by__first_name', 'reconciled_by__last_name',
+)
+
+
+def _per_account_count(queryset, account_field):
+    """Correlated subquery counting rows of ``queryset`` for the outer bank account."""
+    return Subquery(
+        queryset.filter(**{account_field: OuterRef('pk')})
+        .order_by()
+        .values(account_field)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
 
 
 # Dashboard and Overview Views
@@ -25,20 +84,27 @@ def reconciliation_dashboard(request):
     today = timezone.now().date()
     this_month_start = today.replace(day=1)
     
-    # Key metrics
-    total_accounts = BankAccount.objects.filter(is_active=True).count()
-    unreconciled_statements = BankStatement.objects.filter(
-        status__in=['imported', 'processing', 'partially_reconciled']
-    ).count()
-    
-    # Financial metrics
-    total_bank_balance = BankAccount.objects.filter(
-        is_active=True
-    ).aggregate(total=Sum('current_balance'))['total'] or 0
-    
-    unreconciled_transactions = BankTransaction.objects.filter(
-        reconciliation_status='unreconciled'
-    ).count()
+    # Key metrics, gathered in one round-trip: the per-account statement and
+    # transaction counts are correlated subqueries summed over all accounts
+    metrics = BankAccount.objects.annotate(
+        open_statements=_per_account_count(
+            BankStatement.objects.filter(status__in=OPEN_STATEMENT_STATUSES),
+            'bank_account',
+        ),
+        open_transactions=_per_account_count(
+            BankTransaction.objects.filter(reconciliation_status='unreconciled'),
+            'bank_statement__bank_account',
+        ),
+    ).aggregate(
+        total_accounts=Count('pk', filter=Q(is_active=True)),
+        total_bank_balance=Sum('current_balance', filter=Q(is_active=True)),
+        unreconciled_statements=Sum('open_statements'),
+        unreconciled_transactions=Sum('open_transactions'),
+    )
+    total_accounts = metrics['total_accounts']
+    total_bank_balance = metrics['total_bank_balance'] or 0
+    unreconciled_statements = metrics['unreconciled_statements'] or 0
+    unreconciled_transactions = metrics['unreconciled_transactions'] or 0
     
     # Recent activity
     recent_sessions = ReconciliationSession.objects.order_by('-start_date')[:5]
@@ -47,13 +113,14 @@ def reconciliation_dashboard(request):
     ).order_by('-transaction_date')[:10]
     
     # Accounts needing attention
+    # Never-reconciled accounts count as overdue and are listed first
     accounts_needing_reconciliation = BankAccount.objects.filter(
-        is_active=True,
-        last_reconciled_date__lt=today - timedelta(days=30)
-    ).order_by('last_reconciled_date')
+        Q(last_reconciled_date__isnull=True) | Q(last_reconciled_date__lt=today - timedelta(days=30)),
+        is_active=True
+    ).order_by(F('last_reconciled_date').asc(nulls_first=True))[:ACCOUNTS_NEEDING_RECONCILIATION_LIMIT]
     
     # All bank accounts for overview
-    bank_accounts = BankAccount.objects.filter(is_active=True).order_by('bank_name', 'name')
+    bank_accounts = get_active_accounts()
     
     context = {
         'total_accounts': total_accounts,
@@ -78,11 +145,18 @@ class BankAccountListView(LoginRequiredMixin, ListView):
     context_object_name = 'accounts'
     
     def get_queryset(self):
+        # Independent subqueries: joining statements and their transactions in
+        # one GROUP BY multiplies the rows and inflates statement_count
         queryset = BankAccount.objects.annotate(
-            statement_count=Count('statements'),
-            unreconciled_count=Count(
-                'statements__transactions',
-                filter=Q(statements__transactions__reconciliation_status='unreconciled')
+            statement_count=Coalesce(
+                _per_account_count(BankStatement.objects.all(), 'bank_account'), 0
+            ),
+            unreconciled_count=Coalesce(
+                _per_account_count(
+                    BankTransaction.objects.filter(reconciliation_status='unreconciled'),
+                    'bank_statement__bank_account',
+                ),
+                0
             )
         ).order_by('bank_name', 'name')
         
@@ -158,11 +232,12 @@ class BankStatementListView(LoginRequiredMixin, ListView):
     template_name = 'bank_reconciliation/statement_list.html'
     context_object_name = 'statements'
     paginate_by = 20
+    paginator_class = EstimatedCountPaginator
     
     def get_queryset(self):
         queryset = BankStatement.objects.select_related(
             'bank_account', 'reconciled_by'
-        ).annotate(
+        ).only(*STATEMENT_LIST_FIELDS).annotate(
             transaction_count=Count('transactions')
         ).order_by('-statement_date')
         
@@ -188,7 +263,7 @@ class BankStatementListView(LoginRequiredMixin, ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['accounts'] = BankAccount.objects.filter(is_active=True)
+        context['accounts'] = get_active_accounts()
         context['statement_statuses'] = BankStatement.STATUS_CHOICES
         return context
 
@@ -199,9 +274,22 @@ class BankStatementDetailView(LoginRequiredMixin, DetailView):
     template_name = 'bank_reconciliation/statement_detail.html'
     context_object_name = 'statement'
     
+    def get_queryset(self):
+        return BankStatement.objects.select_related(
+            'bank_account', 'reconciled_by'
+        ).prefetch_related(
+            Prefetch(
+                'transactions',
+                queryset=BankTransaction.objects.select_related(
+                    'reconciled_by'
+                ).order_by('-transaction_date'),
+                to_attr='ordered_transactions'
+            )
+        )
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['transactions'] = self.object.transactions.order_by('-transaction_date')
+        context['transactions'] = self.object.ordered_transactions
         context['reconciliation_sessions'] = self.object.reconciliation_sessions.order_by('-start_date')
         return context
 
@@ -229,11 +317,12 @@ class BankTransactionListView(LoginRequiredMixin, ListView):
     template_name = 'bank_reconciliation/transaction_list.html'
     context_object_name = 'transactions'
     paginate_by = 50
+    paginator_class = EstimatedCountPaginator
     
     def get_queryset(self):
         queryset = BankTransaction.objects.select_related(
             'bank_statement__bank_account', 'reconciled_by'
-        ).order_by('-transaction_date', '-created_at')
+        ).only(*TRANSACTION_LIST_FIELDS).order_by('-transaction_date', '-created_at')
         
         # Filter by account
         account = self.request.GET.get('account')
@@ -267,7 +356,7 @@ class BankTransactionListView(LoginRequiredMixin, ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['accounts'] = BankAccount.objects.filter(is_active=True)
+        context['accounts'] = get_active_accounts()
         context['reconciliation_statuses'] = BankTransaction.RECONCILIATION_STATUS
         context['transaction_types'] = BankTransaction.TRANSACTION_TYPES
         return context
@@ -281,7 +370,9 @@ class BankTransactionDetailView(LoginRequiredMixin, DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['adjustments'] = self.object.adjustments.all()
+        context['adjustments'] = self.object.adjustments.select_related(
+            'created_by', 'reconciliation_session'
+        )
         return context
 
 
@@ -311,11 +402,12 @@ class ReconciliationSessionListView(LoginRequiredMixin, ListView):
     template_name = 'bank_reconciliation/session_list.html'
     context_object_name = 'sessions'
     paginate_by = 20
+    paginator_class = EstimatedCountPaginator
     
     def get_queryset(self):
         queryset = ReconciliationSession.objects.select_related(
             'bank_account', 'bank_statement', 'reconciled_by'
-        ).order_by('-start_date')
+        ).only(*SESSION_LIST_FIELDS).order_by('-start_date')
         
         # Filter by account
         account = self.request.GET.get('account')
@@ -331,7 +423,7 @@ class ReconciliationSessionListView(LoginRequiredMixin, ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['accounts'] = BankAccount.objects.filter(is_active=True)
+        context['accounts'] = get_active_accounts()
         context['session_statuses'] = ReconciliationSession.STATUS_CHOICES
         return context
 
@@ -342,9 +434,33 @@ class ReconciliationSessionDetailView(LoginRequiredMixin, DetailView):
     template_name = 'bank_reconciliation/session_detail.html'
     context_object_name = 'session'
     
+    def get_queryset(self):
+        return ReconciliationSession.objects.select_related(
+            'bank_account', 'bank_statement'
+        ).prefetch_related(
+            Prefetch(
+                'bank_statement__transactions',
+                queryset=BankTransaction.objects.only(
+                    'id', 'bank_statement_id', 'transaction_date', 'description',
+                    'amount', 'reconciliation_status'
+                ).order_by('-transaction_date')
+            )
+        )
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['adjustments'] = self.object.adjustments.order_by('-created_at')
+        transactions = list(self.object.bank_statement.transactions.all())
+        context['transactions'] = transactions
+        context['total_transactions'] = len(transactions)
+        context['matched_transactions'] = sum(
+            1 for t in transactions if t.reconciliation_status in ('matched', 'cleared')
+        )
+        context['unmatched_transactions'] = sum(
+            1 for t in transactions if t.reconciliation_status == 'unreconciled'
+        )
+        context['adjustments'] = self.object.adjustments.select_related(
+            'created_by', 'reference_transaction'
+        ).order_by('-created_at')
         return context
 
 
@@ -357,6 +473,12 @@ def start_reconciliation(request, account_id):
         statement_id = request.POST.get('statement_id')
         statement = get_object_or_404(BankStatement, id=statement_id)
         
+        # Seed the counters once; later status changes adjust them incrementally
+        counts = statement.transactions.aggregate(
+            matched=Count('id', filter=Q(reconciliation_status__in=['matched', 'cleared'])),
+            unmatched=Count('id', filter=Q(reconciliation_status='unreconciled')),
+        )
+        
         # Create new reconciliation session
         session = ReconciliationSession.objects.create(
             bank_account=account,
@@ -364,6 +486,8 @@ def start_reconciliation(request, account_id):
             session_name=f"Reconciliation - {account.name} - {statement.statement_date}",
             starting_book_balance=account.current_balance,
             statement_balance=statement.ending_balance,
+            transactions_matched=counts['matched'],
+            transactions_unmatched=counts['unmatched'],
             reconciled_by=request.user
         )
         
@@ -386,56 +510,68 @@ def start_reconciliation(request, account_id):
 @login_required
 def reconcile_transactions(request, session_id):
     """Reconcile transactions in a session."""
-    session = get_object_or_404(ReconciliationSession, id=session_id)
+    session = get_object_or_404(
+        ReconciliationSession.objects.select_related('bank_account', 'bank_statement__bank_account'),
+        id=session_id
+    )
     
     # Get unreconciled transactions for this statement
     transactions = session.bank_statement.transactions.filter(
         reconciliation_status='unreconciled'
-    ).order_by('-transaction_date')
+    ).select_related('reconciled_by').order_by('-transaction_date')
     
     if request.method == 'POST':
         # Process reconciliation actions
         action = request.POST.get('action')
         transaction_ids = request.POST.getlist('transaction_ids')
         
+        # Scope to this session's statement so ids from other statements are ignored
+        selected = BankTransaction.objects.filter(
+            id__in=transaction_ids,
+            bank_statement_id=session.bank_statement_id
+        )
+        
         if action == 'mark_cleared':
-            BankTransaction.objects.filter(
-                id__in=transaction_ids
-            ).update(
-                reconciliation_status='cleared',
-                reconciled_date=timezone.now(),
-                reconciled_by=request.user
-            )
-            
-            session.transactions_matched += len(transaction_ids)
-            session.save()
+            with transaction.atomic():
+                updated = selected.set_status(
+                    'cleared',
+                    reconciled_date=timezone.now(),
+                    reconciled_by=request.user
+                )
             
-            messages.success(request, f'{len(transaction_ids)} transactions marked as cleared!')
+            messages.success(request, f'{updated} transactions marked as cleared!')
         
         elif action == 'mark_disputed':
-            BankTransaction.objects.filter(
-                id__in=transaction_ids
-            ).update(
-                reconciliation_status='disputed',
-                reconciled_date=timezone.now(),
-                reconciled_by=request.user
-            )
+            with transaction.atomic():
+                updated = selected.set_status(
+                    'disputed',
+                    reconciled_date=timezone.now(),
+                    reconciled_by=request.user
+                )
             
-            messages.warning(request, f'{len(transaction_ids)} transactions marked as disputed!')
+            messages.warning(request, f'{updated} transactions marked as disputed!')
         
         return redirect('bank_reconciliation:reconcile_transactions', session_id=session.id)
     
-    # Calculate current reconciliation status
-    cleared_transactions = session.bank_statement.transactions.filter(
-        reconciliation_status='cleared'
+    # Calculate current reconciliation status; the cleared total is summed and
+    # written back by the database in the same UPDATE
+    cleared_total = Coalesce(
+        Subquery(
+            BankTransaction.objects.filter(
+                bank_statement_id=OuterRef('bank_statement_id'),
+                reconciliation_status='cleared'
+            ).order_by().values('bank_statement').annotate(total=Sum('amount')).values('total')
+        ),
+        Decimal('0'),
+        output_field=DecimalField(max_digits=12, decimal_places=2)
     )
-    cleared_amount = cleared_transactions.aggregate(
-        total=Sum('amount')
-    )['total'] or 0
-    
-    session.ending_book_balance = session.starting_book_balance + cleared_amount
-    session.difference = session.statement_balance - session.ending_book_balance
-    session.save()
+    ReconciliationSession.objects.filter(pk=session.pk).update(
+        ending_book_balance=F('starting_book_balance') + cleared_total,
+        difference=F('statement_balance') - (F('starting_book_balance') + cleared_total),
+        updated_at=timezone.now()
+    )
+    session.refresh_from_db(fields=['ending_book_balance', 'difference', 'updated_at'])
+    cleared_amount = session.ending_book_balance - session.starting_book_balance
     
     context = {
         'session': session,
@@ -449,29 +585,39 @@ def reconcile_transactions(request, session_id):
 @login_required
 def complete_reconciliation(request, session_id):
     """Complete a reconciliation session."""
-    session = get_object_or_404(ReconciliationSession, id=session_id)
-    
     if request.method == 'POST':
-        # Mark session as completed
-        session.status = 'completed'
-        session.end_date = timezone.now()
-        
-        # Update statement status
-        if session.difference == 0:
-            session.bank_statement.status = 'reconciled'
-        else:
-            session.bank_statement.status = 'discrepancy'
-        
-        session.bank_statement.reconciliation_date = timezone.now()
-        session.bank_statement.reconciled_by = request.user
-        session.bank_statement.save()
-        
-        # Update account reconciliation date
-        session.bank_account.last_reconciled_date = session.bank_statement.statement_date
-        session.bank_account.last_reconciled_balance = session.statement_balance
-        session.bank_account.save()
-        
-        session.save()
+        now = timezone.now()
+        with transaction.atomic():
+            # Lock the session row so two submissions cannot both complete it
+            session = get_object_or_404(
+                ReconciliationSession.objects.select_for_update(), id=session_id
+            )
+            if session.status == 'completed':
+                messages.info(request, 'This reconciliation has already been completed.')
+                return redirect('bank_reconciliation:session_detail', pk=session.id)
+            
+            # Mark session as completed
+            session.status = 'completed'
+            session.end_date = now
+            session.save(update_fields=['status', 'end_date', 'updated_at'])
+            
+            # Update statement status
+            BankStatement.objects.filter(pk=session.bank_statement_id).update(
+                status='reconciled' if session.difference == 0 else 'discrepancy',
+                reconciliation_date=now,
+                reconciled_by=request.user,
+                updated_at=now
+            )
+            
+            # Update account reconciliation date
+            BankAccount.objects.filter(pk=session.bank_account_id).update(
+                last_reconciled_date=Subquery(
+                    BankStatement.objects.filter(pk=session.bank_statement_id).values('statement_date')
+                ),
+                last_reconciled_balance=session.statement_balance
+            )
+            # update() skips the post_save signal that drops the cached account list
+            transaction.on_commit(lambda: cache.delete(ACTIVE_ACCOUNTS_CACHE_KEY))
         
         if session.difference == 0:
             messages.success(request, 'Reconciliation completed successfully!')
@@ -480,6 +626,7 @@ def complete_reconciliation(request, session_id):
         
         return redirect('bank_reconciliation:session_detail', pk=session.id)
     
+    session = get_object_or_404(ReconciliationSession, id=session_id)
     context = {'session': session}
     return render(request, 'bank_reconciliation/complete_reconciliation.html', context)
 
@@ -513,6 +660,64 @@ class ReconciliationRuleCreateView(LoginRequiredMixin, CreateView):
 
 
 # Import/Export Views
+# Uploads above this size (roughly 1000 statement lines) are parsed with pandas
+PANDAS_IMPORT_THRESHOLD = 64 * 1024
+
+
+def _read_transaction_rows(csv_file):
+    """
+    Parse an uploaded statement CSV into
+    (date, description, type, amount, check_number, reference) tuples.
+    
+    Large files are parsed column-wise with pandas when it is installed;
+    small ones go through the csv module, which has less start-up overhead.
+    """
+    if csv_file.size > PANDAS_IMPORT_THRESHOLD:
+        try:
+            import pandas as pd
+        except ImportError:
+            pd = None
+        
+        if pd is not None:
+            df = pd.read_csv(csv_file, dtype=str, keep_default_na=False)
+            
+            def column(name, default):
+                return df[name] if name in df.columns else [default] * len(df)
+            
+            return list(zip(
+                pd.to_datetime(df['date'], format='%Y-%m-%d').dt.date,
+                df['description'],
+                column('type', 'other'),
+                df['amount'].map(Decimal),
+                column('check_number', ''),
+                column('reference', ''),
+            ))
+    
+    # Decode while reading instead of holding the bytes and a list of lines
+    reader = csv.reader(io.TextIOWrapper(csv_file, encoding='utf-8', newline=''))
+    
+    # Resolve column positions once instead of building a dict per row
+    columns = {name: index for index, name in enumerate(next(reader, []))}
+    date_col = columns['date']
+    description_col = columns['description']
+    amount_col = columns['amount']
+    type_col = columns.get('type')
+    check_number_col = columns.get('check_number')
+    reference_col = columns.get('reference')
+    
+    return [
+        (
+            datetime.strptime(row[date_col], '%Y-%m-%d').date(),
+            row[description_col],
+            row[type_col] if type_col is not None else 'other',
+            Decimal(row[amount_col]),
+            row[check_number_col] if check_number_col is not None else '',
+            row[reference_col] if reference_col is not None else '',
+        )
+        for row in reader if row
+    ]
+
+
 @login_required
 def import_transactions(request, statement_id):
     """Import transactions from CSV file."""
@@ -522,23 +727,25 @@ def import_transactions(request, statement_id):
         csv_file = request.FILES['csv_file']
         
         try:
-            # Read CSV file
-            decoded_file = csv_file.read().decode('utf-8').splitlines()
-            reader = csv.DictReader(decoded_file)
-            
-            transactions_created = 0
-            for row in reader:
-                # Create transaction from CSV row
-                BankTransaction.objects.create(
+            new_transactions = [
+                BankTransaction(
                     bank_statement=statement,
-                    transaction_date=datetime.strptime(row['date'], '%Y-%m-%d').date(),
-                    description=row['description'],
-                    transaction_type=row.get('type', 'other'),
-                    amount=Decimal(row['amount']),
-                    check_number=row.get('check_number', ''),
-                    reference_number=row.get('reference', ''),
+                    transaction_date=transaction_date,
+                    description=description,
+                    transaction_type=transaction_type,
+                    amount=amount,
+                    check_number=check_number,
+                    reference_number=reference_number,
                 )
-                transactions_created += 1
+                for (transaction_date, description, transaction_type, amount,
+                     check_number, reference_number) in _read_transaction_rows(csv_file)
+            ]
+            
+            transactions_created = len(new_transactions)
+            with transaction.atomic():
+                BankTransaction.objects.bulk_create(new_transactions, batch_size=1000)
+                # bulk_create skips post_save, so count the new rows in open sessions here
+                adjust_session_counters(statement.id, None, 'unreconciled', transactions_created)
             
             messages.success(request, f'Successfully imported {transactions_created} transactions!')
             return redirect('bank_reconciliation:statement_detail', pk=statement.id)
@@ -568,27 +775,36 @@ def export_transactions(request, account_id):
     if end_date:
         transactions = transactions.filter(transaction_date__lte=end_date)
     
-    # Create CSV response
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="transactions_{account.name}_{timezone.now().strftime("%Y%m%d")}.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Date', 'Description', 'Type', 'Amount', 'Check Number',
-        'Reference', 'Status', 'Running Balance'
-    ])
-    
-    for transaction in transactions:
-        writer.writerow([
-            transaction.transaction_date,
-            transaction.description,
-            transaction.get_transaction_type_display(),
-            transaction.amount,
-            transaction.check_number,
-            transaction.reference_number,
-            transaction.get_reconciliation_status_display(),
-            transaction.running_balance or ''
+    transactions = transactions.only(
+        'transaction_date', 'description', 'transaction_type', 'amount',
+        'check_number', 'reference_number', 'reconciliation_status', 'running_balance'
+    )
+    
+    type_labels = BankTransaction.TRANSACTION_TYPE_LABELS
+    status_labels = BankTransaction.RECONCILIATION_STATUS_LABELS
+    
+    def csv_rows():
+        writer = csv.writer(Echo())
+        yield writer.writerow([
+            'Date', 'Description', 'Type', 'Amount', 'Check Number',
+            'Reference', 'Status', 'Running Balance'
         ])
+        for transaction in transactions.iterator(chunk_size=2000):
+            yield writer.writerow([
+                transaction.transaction_date,
+                transaction.description,
+                type_labels.get(transaction.transaction_type, transaction.transaction_type),
+                format(transaction.amount, 'f'),
+                transaction.check_number,
+                transaction.reference_number,
+                status_labels.get(transaction.reconciliation_status, transaction.reconciliation_status),
+                format(transaction.running_balance, 'f') if transaction.running_balance else ''
+            ])
+    
+    # Stream the CSV so large exports are never held in memory
+    timestamp = timezone.now().strftime('%Y%m%d')
+    response = StreamingHttpResponse(csv_rows(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="transactions_{account.name}_{timestamp}.csv"'
     
     return response
 
@@ -598,12 +814,15 @@ def export_transactions(request, account_id):
 def mark_transaction_cleared(request, transaction_id):
     """Mark a transaction as cleared via AJAX."""
     if request.method == 'POST':
-        transaction = get_object_or_404(BankTransaction, id=transaction_id)
-        
-        transaction.reconciliation_status = 'cleared'
-        transaction.reconciled_date = timezone.now()
-        transaction.reconciled_by = request.user
-        transaction.save()
+        # One narrow UPDATE instead of fetching and re-saving the whole row
+        with transaction.atomic():
+            updated = BankTransaction.objects.filter(id=transaction_id).set_status(
+                'cleared',
+                reconciled_date=timezone.now(),
+                reconciled_by=request.user
+            )
+        if not updated:
+            raise Http404('No BankTransaction matches the given query.')
         
         return JsonResponse({
             'success': True,
@@ -622,31 +841,21 @@ def auto_match_transactions(request, session_id):
     rules = ReconciliationRule.objects.filter(is_active=True)
     unreconciled_transactions = session.bank_statement.transactions.filter(
         reconciliation_status='unreconciled'
-    )
+    ).as_cents('description', 'reference_number')
     
-    matched_count = 0
+    matched_ids = match_transactions(rules, unreconciled_transactions)
     
-    for transaction in unreconciled_transactions:
-        for rule in rules:
-            match_confidence = 0
-            
-            # Apply rule logic based on rule type
-            if rule.rule_type == 'description_contains':
-                if rule.description_pattern.lower() in transaction.description.lower():
-                    match_confidence = 90
-            elif rule.rule_type == 'amount_exact':
-                if rule.amount_min <= transaction.amount <= rule.amount_max:
-                    match_confidence = 95
-            # Add more rule types as needed
-            
-            if match_confidence >= rule.confidence_threshold:
-                if rule.auto_match:
-                    transaction.reconciliation_status = 'matched'
-                    transaction.reconciled_date = timezone.now()
-                    transaction.reconciled_by = request.user
-                    transaction.save()
-                    matched_count += 1
-                break
+    # One UPDATE for every match instead of a save() per transaction
+    with transaction.atomic():
+        matched_count = BankTransaction.objects.filter(
+            id__in=matched_ids,
+            reconciliation_status='unreconciled'
+        ).update(
+            reconciliation_status='matched',
+            reconciled_date=timezone.now(),
+            reconciled_by=request.user
+        )
+        adjust_session_counters(session.bank_statement_id, 'unreconciled', 'matched', matched_count)
     
     return JsonResponse({
         'success': True,
@@ -655,11 +864,25 @@ def auto_match_transactions(request, session_id):
     })
 
 
+def _count_unreconciled():
+    """
+    Count unreconciled transactions for the dashboard badge.
+    
+    Once the backlog is large the planner's estimate is close enough for a
+    badge, so only small backlogs are counted exactly.
+    """
+    queryset = BankTransaction.objects.filter(reconciliation_status='unreconciled')
+    estimate = estimated_query_count(queryset)
+    if estimate is not None and estimate >= EstimatedCountPaginator.exact_count_threshold:
+        return estimate
+    return queryset.count()
+
+
 @login_required
+@cache_control(private=True, max_age=UNRECONCILED_COUNT_TTL)
 def unreconciled_count(request):
     """API endpoint to get the count of unreconciled transactions."""
-    count = BankTransaction.objects.filter(
-        reconciliation_status='unreconciled'
-    ).count()
+    # Polled by the dashboard badge, so a count up to 30 seconds old is fine
+    count = cache.get_or_set('br:unreconciled_count', _count_unreconciled, UNRECONCILED_COUNT_TTL)
     
     return JsonResponse({'count': count})
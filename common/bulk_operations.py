@@ -5,12 +5,25 @@ Provides standardized bulk delete and export functionality across modules
 
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.utils import timezone
 from django.apps import apps
 import json
 import csv
+import io
+import logging
+from collections import namedtuple
+from functools import lru_cache
+from operator import attrgetter, methodcaller
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+logger = logging.getLogger(__name__)
 
 
 class BulkOperationsError(Exception):
@@ -18,6 +31,23 @@ class BulkOperationsError(Exception):
     pass
 
 
+# Upper bound on a single bulk selection, to keep each request's queries bounded
+MAX_BULK_ITEMS = 10000
+
+# Primary keys per pk__in query; keeps parameter counts and plans sane
+BULK_CHUNK_SIZE = 1000
+
+
+# One export column. Plain (field_name, header_name, accessor) tuples are still
+# accepted; select_related/prefetch_related name the relations the accessor reads.
+ExportField = namedtuple(
+    'ExportField',
+    ['field_name', 'header_name', 'accessor', 'select_related', 'prefetch_related'],
+    defaults=((), ()),
+)
+
+
+@lru_cache(maxsize=None)
 def get_model_class(app_label, model_name):
     """Get Django model class from app and model name"""
     try:
@@ -26,6 +56,118 @@ def get_model_class(app_label, model_name):
         raise BulkOperationsError(f"Model {app_label}.{model_name} not found")
 
 
+@lru_cache(maxsize=None)
+def get_owner_field(Model):
+    """Name of the field linking a model to its owning user, or None"""
+    if hasattr(Model, 'user'):
+        return 'user'
+    if hasattr(Model, 'created_by'):
+        return 'created_by'
+    return None
+
+
+def chunked(items, size=BULK_CHUNK_SIZE):
+    """Yield successive slices of at most ``size`` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def bulk_set_fields(queryset, batch_size=5000, **fields):
+    """
+    Set fields on every row of a queryset with batched UPDATE statements
+    
+    Meant for admin actions and other mass edits: no instances are loaded or
+    saved, so model save() and signals are skipped.
+    
+    Returns:
+        int: Number of rows updated
+    """
+    pks = list(queryset.order_by().values_list('pk', flat=True))
+    manager = queryset.model._base_manager
+    return sum(
+        manager.filter(pk__in=chunk).update(**fields)
+        for chunk in chunked(pks, batch_size)
+    )
+
+
+def parse_item_ids(request):
+    """
+    Read the selected primary keys from the POSTed JSON list, without duplicates
+    
+    Raises:
+        ValueError: If the payload is not a JSON list of integers
+        BulkOperationsError: If more than MAX_BULK_ITEMS are selected
+    """
+    item_ids_param = request.POST.get('item_ids') or request.POST.get('invoice_ids')  # Backward compatibility
+    item_ids = json_loads(item_ids_param or '[]')
+    if not isinstance(item_ids, list):
+        raise ValueError('item_ids must be a list')
+    
+    # A key selected twice is still one item
+    item_ids = list(dict.fromkeys(int(item_id) for item_id in item_ids))
+    if len(item_ids) > MAX_BULK_ITEMS:
+        raise BulkOperationsError(f"At most {MAX_BULK_ITEMS} items can be processed at once")
+    return item_ids
+
+
+def get_export_only_fields(Model, fields_config):
+    """
+    Return the model fields an export reads, for use with QuerySet.only()
+    
+    Accessors are expected to read their own field_name and declared relations.
+    Returns None when a column reads a computed attribute (e.g. a property),
+    since its underlying columns are unknown and must not be deferred.
+    """
+    concrete_fields = {field.name for field in Model._meta.concrete_fields}
+    only_fields = {Model._meta.pk.name}
+    for config in fields_config:
+        if config.field_name in concrete_fields:
+            only_fields.add(config.field_name)
+        elif hasattr(Model, config.field_name):
+            return None
+        # Relations must stay loaded to be followed by select_related
+        only_fields.update(path.split('__')[0] for path in config.select_related)
+    return only_fields
+
+
+def format_export_value(value):
+    """Render a single export cell: blank for None, ISO date for dates, else str()"""
+    if value is None:
+        return ''
+    strftime = getattr(value, 'strftime', None)
+    return strftime('%Y-%m-%d') if strftime else str(value)
+
+
+def compile_export_row(fields_config):
+    """
+    Turn fields_config into a function mapping a model instance to a CSV row
+    
+    Column lookups are resolved once here instead of per cell, so the export
+    loop only calls one prebuilt function per column.
+    """
+    columns = []
+    for config in fields_config:
+        if config.accessor:
+            columns.append(config.accessor)
+        else:
+            columns.append(lambda item, name=config.field_name: getattr(item, name, ''))
+    
+    def safe_cell(column, item):
+        try:
+            return format_export_value(column(item))
+        except Exception:
+            return ''  # If there's an error accessing the field, use empty string
+    
+    def build_row(item):
+        try:
+            return [format_export_value(column(item)) for column in columns]
+        except Exception:
+            # Redo the row cell by cell so only the failing cell is left blank
+            return [safe_cell(column, item) for column in columns]
+    
+    return build_row
+
+
 def can_delete_item(item, entity_type):
     """
     Determine if an item can be deleted based on business rules
@@ -42,6 +184,14 @@ def can_delete_item(item, entity_type):
         return True
 
 
+# Fields read by can_delete_item() plus the ones naming skipped items;
+# only these are loaded before deleting
+DELETE_RULE_FIELDS = ('status', 'is_active', 'name', 'invoice_number')
+
+# Number of skipped item names returned to the frontend
+MAX_SKIPPED_NAMES = 5
+
+
 def bulk_delete_view(request, app_label, model_name, entity_type):
     """
     Generic bulk delete view that can be used across different models
@@ -63,53 +213,90 @@ def bulk_delete_view(request, app_label, model_name, entity_type):
         Model = get_model_class(app_label, model_name)
         
         # Parse item IDs from request
-        item_ids_param = request.POST.get('item_ids') or request.POST.get('invoice_ids')  # Backward compatibility
-        item_ids = json.loads(item_ids_param or '[]')
+        item_ids = parse_item_ids(request)
         
         if not item_ids:
             return JsonResponse({'error': f'No {entity_type}s selected'}, status=400)
         
         # Get items that belong to the current user
-        queryset = Model.objects.filter(pk__in=item_ids)
+        queryset = Model.objects.all()
         
         # Filter by user if the model has a user field
-        if hasattr(Model, 'user'):
-            queryset = queryset.filter(user=request.user)
-        elif hasattr(Model, 'created_by'):
-            queryset = queryset.filter(created_by=request.user)
+        owner_field = get_owner_field(Model)
+        if owner_field:
+            queryset = queryset.filter(**{owner_field: request.user})
         
+        # Decide deletability on narrow rows, then remove them with one DELETE per chunk
+        rule_fields = [
+            field.name for field in Model._meta.concrete_fields
+            if field.name in DELETE_RULE_FIELDS
+        ]
+        deletable_pks = []
+        blocked_count = 0
+        skipped_names = []
+        for chunk in chunked(item_ids):
+            for item in queryset.filter(pk__in=chunk).only(*rule_fields):
+                if can_delete_item(item, entity_type):
+                    deletable_pks.append(item.pk)
+                    continue
+                blocked_count += 1
+                if len(skipped_names) < MAX_SKIPPED_NAMES:
+                    skipped_names.append(
+                        getattr(item, 'name', None) or getattr(item, 'invoice_number', None) or str(item.pk)
+                    )
         deleted_count = 0
-        skipped_count = 0
+        delete_error = None
         
-        for item in queryset:
+        if deletable_pks:
             try:
-                if can_delete_item(item, entity_type):
-                    item_identifier = getattr(item, 'name', None) or getattr(item, 'invoice_number', None) or str(item.pk)
-                    item.delete()
-                    deleted_count += 1
-                    messages.success(request, f'{entity_type.title()} {item_identifier} deleted successfully.')
-                else:
-                    skipped_count += 1
+                # All chunks or none, so a failure never leaves a partial delete
+                with transaction.atomic():
+                    for chunk in chunked(deletable_pks):
+                        _, deleted_per_model = Model.objects.filter(pk__in=chunk).delete()
+                        deleted_count += deleted_per_model.get(Model._meta.label, 0)
             except Exception as e:
-                skipped_count += 1
-                messages.warning(request, f'Could not delete {entity_type}: {str(e)}')
+                delete_error = str(e)
         
-        # Account for items that were not found or don't belong to user
         total_requested = len(item_ids)
-        not_found_count = total_requested - (deleted_count + skipped_count)
-        skipped_count += not_found_count
+        if delete_error:
+            # Nothing was deleted; the deletable items still exist
+            failed_count = len(deletable_pks)
+            return JsonResponse({
+                'success': False,
+                'error': f'Could not delete {entity_type}s: {delete_error}',
+                'deleted_count': 0,
+                'failed_count': failed_count,
+                'blocked_count': blocked_count,
+                'missing_count': total_requested - failed_count - blocked_count,
+                'skipped_names': skipped_names,
+                'total_requested': total_requested
+            }, status=500)
+        
+        # Skipped items are the ones blocked by can_delete_item() plus the
+        # missing ones: not found, not the user's or gone before the delete
+        skipped_count = total_requested - deleted_count
+        missing_count = skipped_count - blocked_count
         
+        # A single message per request; the counts travel in the JSON payload
         if skipped_count > 0:
-            messages.warning(request, f'{skipped_count} {entity_type}(s) were skipped or could not be deleted.')
+            messages.warning(
+                request,
+                f'{deleted_count} {entity_type}(s) deleted; {skipped_count} were skipped or could not be deleted.'
+            )
+        elif deleted_count:
+            messages.success(request, f'{deleted_count} {entity_type}(s) deleted successfully.')
         
         return JsonResponse({
             'success': True,
             'deleted_count': deleted_count,
             'skipped_count': skipped_count,
+            'blocked_count': blocked_count,
+            'missing_count': missing_count,
+            'skipped_names': skipped_names,
             'total_requested': total_requested
         })
         
-    except json.JSONDecodeError:
+    except (ValueError, TypeError):
         return JsonResponse({'error': f'Invalid {entity_type} IDs format'}, status=400)
     except BulkOperationsError as e:
         return JsonResponse({'error': str(e)}, status=400)
@@ -126,7 +313,7 @@ def bulk_export_view(request, app_label, model_name, entity_type, fields_config)
         app_label: Django app label
         model_name: Model name
         entity_type: Human-readable entity type
-        fields_config: List of tuples (field_name, header_name, accessor_function)
+        fields_config: List of ExportField (or (field_name, header_name, accessor_function) tuples)
     """
     if not request.user.is_authenticated:
         messages.error(request, 'Authentication required.')
@@ -141,68 +328,88 @@ def bulk_export_view(request, app_label, model_name, entity_type, fields_config)
         Model = get_model_class(app_label, model_name)
         
         # Parse item IDs from request
-        item_ids_param = request.POST.get('item_ids') or request.POST.get('invoice_ids')  # Backward compatibility
-        item_ids = json.loads(item_ids_param or '[]')
+        item_ids = parse_item_ids(request)
         
         if not item_ids:
             messages.error(request, f'No {entity_type}s selected for export.')
             return redirect('dashboard:home')
         
         # Get items that belong to the current user
-        queryset = Model.objects.filter(pk__in=item_ids)
+        queryset = Model.objects.all()
         
         # Filter by user if the model has a user field
-        if hasattr(Model, 'user'):
-            queryset = queryset.filter(user=request.user)
-        elif hasattr(Model, 'created_by'):
-            queryset = queryset.filter(created_by=request.user)
+        owner_field = get_owner_field(Model)
+        if owner_field:
+            queryset = queryset.filter(**{owner_field: request.user})
         
-        # Add select_related/prefetch_related for common relationships
-        if hasattr(Model, 'customer'):
-            queryset = queryset.select_related('customer')
-        if hasattr(Model, 'category'):
-            queryset = queryset.select_related('category')
+        # Join exactly the relations the configured accessors read
+        fields_config = [ExportField(*config) for config in fields_config]
+        select_related = set()
+        prefetch_related = set()
+        for config in fields_config:
+            select_related.update(config.select_related)
+            prefetch_related.update(config.prefetch_related)
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(prefetch_related))
         
-        queryset = queryset.order_by('-pk')  # Most recent first
+        # Skip the columns no export field reads (notes, addresses, ...)
+        only_fields = get_export_only_fields(Model, fields_config)
+        if only_fields:
+            queryset = queryset.only(*sorted(only_fields))
         
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{entity_type}s_export_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
+        queryset = queryset.order_by('-pk')  # Most recent first
         
-        writer = csv.writer(response)
+        build_row = compile_export_row(fields_config)
+        chunks = chunked(sorted(item_ids, reverse=True))
         
-        # Write header
-        header = [config[1] for config in fields_config]
-        writer.writerow(header)
+        # Build the first chunk before streaming starts, so a bad queryset or
+        # accessor still ends in the error redirect instead of a 200 response
+        first_rows = [build_row(item) for item in queryset.filter(pk__in=next(chunks))]
         
-        # Write data
-        for item in queryset:
-            row = []
-            for field_name, header_name, accessor_func in fields_config:
-                try:
-                    if accessor_func:
-                        value = accessor_func(item)
-                    else:
-                        value = getattr(item, field_name, '')
-                    
-                    # Convert to string and handle None values
-                    if value is None:
-                        value = ''
-                    elif hasattr(value, 'strftime'):
-                        value = value.strftime('%Y-%m-%d')
-                    else:
-                        value = str(value)
-                    
-                    row.append(value)
-                except Exception:
-                    row.append('')  # If there's an error accessing the field, use empty string
+        def csv_rows():
+            # Rows are collected in a buffer and sent one chunk at a time
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            
+            # Write header
+            writer.writerow([config.header_name for config in fields_config])
+            writer.writerows(first_rows)
+            exported_count = len(first_rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
             
-            writer.writerow(row)
+            # Write the rest, one bounded pk__in query per chunk of the selection
+            try:
+                for chunk in chunks:
+                    rows = [build_row(item) for item in queryset.filter(pk__in=chunk)]
+                    writer.writerows(rows)
+                    exported_count += len(rows)
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            except Exception:
+                # The status line is already sent; log and mark the file as
+                # incomplete rather than cutting it off without a trace
+                logger.exception(
+                    f"Export of {entity_type}s for user {request.user.pk} failed after {exported_count} rows"
+                )
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerow([f'Export incomplete: stopped after {exported_count} rows because of an error'])
+                yield buffer.getvalue()
+                return
+            
+            logger.info(f"Exported {exported_count} {entity_type}(s) for user {request.user.pk}")
         
-        messages.success(request, f'{len(queryset)} {entity_type}(s) exported successfully.')
+        # Stream the CSV so large exports are never held in memory
+        response = StreamingHttpResponse(csv_rows(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{entity_type}s_export_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
         return response
         
-    except json.JSONDecodeError:
+    except (ValueError, TypeError):
         messages.error(request, 'Invalid export data format.')
         return redirect('dashboard:home')
     except BulkOperationsError as e:
@@ -216,12 +423,12 @@ def bulk_export_view(request, app_label, model_name, entity_type, fields_config)
 # Pre-configured field mappings for common models
 INVOICE_FIELDS_CONFIG = [
     ('invoice_number', 'Invoice Number', None),
-    ('customer', 'Customer Name', lambda obj: getattr(obj.customer, 'name', '')),
-    ('customer', 'Customer Company', lambda obj: getattr(obj.customer, 'company', '')),
-    ('customer', 'Customer Email', lambda obj: getattr(obj.customer, 'email', '')),
+    ExportField('customer', 'Customer Name', attrgetter('customer.name'), ('customer',)),
+    ExportField('customer', 'Customer Company', attrgetter('customer.company'), ('customer__company',)),
+    ExportField('customer', 'Customer Email', attrgetter('customer.email'), ('customer',)),
     ('date_created', 'Date Created', None),
     ('date_due', 'Date Due', None),
-    ('status', 'Status', lambda obj: obj.get_status_display() if hasattr(obj, 'get_status_display') else obj.status),
+    ('status', 'Status', methodcaller('get_status_display')),
     ('subtotal', 'Subtotal', None),
     ('tax_amount', 'Tax Amount', None),
     ('total_amount', 'Total Amount', None),
@@ -259,10 +466,10 @@ EMPLOYEE_FIELDS_CONFIG = [
 EXPENSE_FIELDS_CONFIG = [
     ('description', 'Description', None),
     ('amount', 'Amount', None),
-    ('category', 'Category', lambda obj: getattr(obj.category, 'name', '') if obj.category else ''),
+    ExportField('category', 'Category', lambda obj: obj.category.name if obj.category else '', ('category',)),
     ('date', 'Date', None),
-    ('vendor', 'Vendor', None),
-    ('status', 'Status', lambda obj: obj.get_status_display() if hasattr(obj, 'get_status_display') else obj.status),
+    ExportField('vendor', 'Vendor', None, ('vendor',)),
+    ('status', 'Status', methodcaller('get_status_display')),
     ('payment_method', 'Payment Method', None),
     ('notes', 'Notes', None),
     ('receipt_url', 'Receipt', None),
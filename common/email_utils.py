@@ -2,19 +2,22 @@
 Email Notification Utilities for DreamBiz
 Centralized email sending functionality
 """
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
+from django.utils.html import escape
 from datetime import datetime, date
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def send_email(subject, template_name, context, recipient_list, from_email=None):
+def build_email(subject, template_name, context, recipient_list, from_email=None, connection=None,
+                html_content=None):
     """
-    Send HTML email using template
+    Build an HTML email from a template without sending it
     
     Args:
         subject (str): Email subject
@@ -22,28 +25,55 @@ def send_email(subject, template_name, context, recipient_list, from_email=None)
         context (dict): Template context variables
         recipient_list (list): List of recipient email addresses
         from_email (str): Sender email (optional, uses default if not provided)
+        connection: Mail backend connection to send through (optional)
+        html_content (str): Already rendered HTML; skips rendering the template
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        EmailMultiAlternatives: The rendered email
     """
     if from_email is None:
         from_email = settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else settings.EMAIL_HOST_USER
     
-    try:
+    if html_content is None:
         # Add common context variables
         context['current_year'] = datetime.now().year
         
         # Render HTML content
         html_content = render_to_string(template_name, context)
-        
-        # Create email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body='Please view this email in an HTML-capable email client.',
-            from_email=from_email,
-            to=recipient_list
+    
+    # Create email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body='Please view this email in an HTML-capable email client.',
+        from_email=from_email,
+        to=recipient_list,
+        connection=connection
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+
+def send_email(subject, template_name, context, recipient_list, from_email=None, connection=None,
+               html_content=None):
+    """
+    Send HTML email using template
+    
+    Args:
+        subject (str): Email subject
+        template_name (str): Template path (e.g., 'emails/welcome.html')
+        context (dict): Template context variables
+        recipient_list (list): List of recipient email addresses
+        from_email (str): Sender email (optional, uses default if not provided)
+        connection: Open mail backend connection to reuse (optional)
+        html_content (str): Already rendered HTML; skips rendering the template
+    
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    try:
+        email = build_email(
+            subject, template_name, context, recipient_list, from_email, connection, html_content
         )
-        email.attach_alternative(html_content, "text/html")
         
         # Send email
         email.send(fail_silently=False)
@@ -55,6 +85,38 @@ def send_email(subject, template_name, context, recipient_list, from_email=None)
         return False
 
 
+# Stand-ins rendered into shared templates and swapped per recipient afterwards
+RECIPIENT_PLACEHOLDERS = {
+    'recipient_name': '[[recipient_name]]',
+    'recipient_email': '[[recipient_email]]',
+}
+
+
+def render_recipient_template(template_name, context):
+    """
+    Render a template once for a whole recipient list
+    
+    The recipient-specific variables are rendered as placeholders, so sending
+    to many people costs one template render plus a few string replacements.
+    
+    Returns:
+        callable: Takes recipient_name/recipient_email keywords, returns the HTML
+    """
+    html_content = render_to_string(template_name, {
+        **context,
+        **RECIPIENT_PLACEHOLDERS,
+        'current_year': datetime.now().year,
+    })
+    
+    def render(**recipient):
+        content = html_content
+        for key, placeholder in RECIPIENT_PLACEHOLDERS.items():
+            content = content.replace(placeholder, escape(recipient.get(key, '')))
+        return content
+    
+    return render
+
+
 def send_welcome_email(user, request=None):
     """Send welcome email to newly registered user"""
     dashboard_url = request.build_absolute_uri('/dashboard/') if request else 'http://localhost:8000/dashboard/'
@@ -74,10 +136,10 @@ def send_welcome_email(user, request=None):
     )
 
 
-def send_invoice_reminder(invoice, request=None):
-    """Send payment reminder for overdue invoice"""
+def build_invoice_reminder_email(invoice, request=None, connection=None):
+    """Build the payment reminder email for an overdue invoice"""
     
-    days_overdue = (date.today() - invoice.due_date).days
+    days_overdue = (date.today() - invoice.date_due).days
     invoice_url = request.build_absolute_uri(f'/invoicing/invoice/{invoice.id}/') if request else f'http://localhost:8000/invoicing/invoice/{invoice.id}/'
     
     # Get company details
@@ -92,14 +154,28 @@ def send_invoice_reminder(invoice, request=None):
         'company_phone': company.phone if company else '',
     }
     
-    return send_email(
+    return build_email(
         subject=f'Payment Reminder: Invoice {invoice.invoice_number} is Overdue',
         template_name='emails/invoice_reminder.html',
         context=context,
-        recipient_list=[invoice.customer.email]
+        recipient_list=[invoice.customer.email],
+        connection=connection
     )
 
 
+def send_invoice_reminder(invoice, request=None):
+    """Send payment reminder for overdue invoice"""
+    subject = f'Payment Reminder: Invoice {invoice.invoice_number} is Overdue'
+    recipient_list = [invoice.customer.email]
+    try:
+        build_invoice_reminder_email(invoice, request).send(fail_silently=False)
+        logger.info(f"Email sent successfully: {subject} to {recipient_list}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to send email: {subject} to {recipient_list}. Error: {str(e)}")
+        return False
+
+
 def send_expense_notification(expense, action, recipient, request=None):
     """
     Send expense notification email
@@ -153,55 +229,126 @@ def send_report_share_email(report_data, recipients, sender, message='', request
     if request and not report_url.startswith('http'):
         report_url = request.build_absolute_uri(report_url)
     
-    for recipient_email in recipients:
-        # Extract name from email (before @)
-        recipient_name = recipient_email.split('@')[0].replace('.', ' ').title()
-        
-        context = {
-            'recipient_name': recipient_name,
-            'recipient_email': recipient_email,
-            'sender_name': sender.get_full_name() if hasattr(sender, 'get_full_name') else sender.username,
-            'report_name': report_data.get('name', 'Financial Report'),
-            'report_type': report_data.get('type', 'General Report'),
-            'report_period': report_data.get('period', 'Current Period'),
-            'generated_date': timezone.now(),
-            'report_url': report_url,
-            'message': message,
-            'attachment': report_data.get('has_attachment', False),
-        }
-        
-        send_email(
-            subject=f'{report_data.get("name", "Report")} - Shared by {sender.get_full_name()}',
-            template_name='emails/report_share.html',
-            context=context,
-            recipient_list=[recipient_email]
-        )
+    # Everything except the recipient is the same for every email
+    sender_name = sender.get_full_name() if hasattr(sender, 'get_full_name') else sender.username
+    report_name = report_data.get('name', 'Financial Report')
+    subject = f'{report_data.get("name", "Report")} - Shared by {sender_name}'
+    base_context = {
+        'sender_name': sender_name,
+        'report_name': report_name,
+        'report_type': report_data.get('type', 'General Report'),
+        'report_period': report_data.get('period', 'Current Period'),
+        'generated_date': timezone.now(),
+        'report_url': report_url,
+        'message': message,
+        'attachment': report_data.get('has_attachment', False),
+    }
+    
+    render = render_recipient_template('emails/report_share.html', base_context)
+    
+    # One SMTP session for all recipients
+    with get_connection() as connection:
+        for recipient_email in recipients:
+            # Extract name from email (before @)
+            recipient_name = recipient_email.split('@')[0].replace('.', ' ').title()
+            
+            send_email(
+                subject=subject,
+                template_name='emails/report_share.html',
+                context=base_context,
+                recipient_list=[recipient_email],
+                connection=connection,
+                html_content=render(recipient_name=recipient_name, recipient_email=recipient_email)
+            )
     
     return True
 
 
-def send_bulk_invoice_reminders():
+REMINDER_BATCH_SIZE = 50
+
+
+def _send_batch(connection, messages):
     """
-    Send reminders for all overdue invoices
-    Called by scheduled task (e.g., daily cron job)
+    Send prepared messages over an open connection
+    
+    Returns:
+        tuple: (sent count, failed count)
     """
+    try:
+        sent = connection.send_messages(messages) or 0
+    except Exception as e:
+        logger.error(f"Failed to send {len(messages)} reminder emails. Error: {str(e)}")
+        return 0, len(messages)
+    return sent, len(messages) - sent
+
+
+def get_overdue_invoices():
+    """Overdue unpaid invoices whose customer can be emailed"""
     from invoicing.models import Invoice
     
-    # Get all overdue unpaid invoices
-    overdue_invoices = Invoice.objects.filter(
-        due_date__lt=date.today(),
+    return Invoice.objects.filter(
+        date_due__lt=date.today(),
         status__in=['sent', 'partial']
-    ).select_related('customer', 'company')
+    ).exclude(
+        Q(customer__email__isnull=True) | Q(customer__email='')
+    ).select_related('customer', 'company').only(
+        'id', 'invoice_number', 'date_due', 'total_amount',
+        'customer__name', 'customer__email',
+        'company__name', 'company__email', 'company__phone'
+    )
+
+
+def send_bulk_invoice_reminders():
+    """
+    Send reminders for all overdue invoices in the calling process
+    Used by queue_bulk_invoice_reminders() when Celery is not installed
+    """
+    overdue_invoices = get_overdue_invoices()
     
     sent_count = 0
     failed_count = 0
     
-    for invoice in overdue_invoices:
-        if invoice.customer.email:
-            if send_invoice_reminder(invoice):
-                sent_count += 1
-            else:
+    # Reuse one SMTP session and hand the backend batches of messages
+    with get_connection() as connection:
+        batch = []
+        # Stream the invoices instead of holding every overdue one in memory
+        for invoice in overdue_invoices.iterator(chunk_size=500):
+            try:
+                batch.append(build_invoice_reminder_email(invoice, connection=connection))
+            except Exception as e:
                 failed_count += 1
+                logger.error(f"Failed to build reminder for invoice {invoice.invoice_number}. Error: {str(e)}")
+            if len(batch) >= REMINDER_BATCH_SIZE:
+                sent, failed = _send_batch(connection, batch)
+                sent_count += sent
+                failed_count += failed
+                batch = []
+        if batch:
+            sent, failed = _send_batch(connection, batch)
+            sent_count += sent
+            failed_count += failed
     
     logger.info(f"Bulk invoice reminders: {sent_count} sent, {failed_count} failed")
     return {'sent': sent_count, 'failed': failed_count}
+
+
+def queue_bulk_invoice_reminders():
+    """
+    Queue one Celery task per overdue invoice so reminders are sent in parallel
+    by the workers instead of one after another in the calling process
+    Called by the send_invoice_reminders command (e.g., daily cron job)
+    
+    Falls back to send_bulk_invoice_reminders() when Celery is not installed.
+    """
+    try:
+        from celery import group
+        from .tasks import send_invoice_reminder_task
+    except ImportError:
+        return send_bulk_invoice_reminders()
+    
+    invoice_ids = list(get_overdue_invoices().values_list('pk', flat=True))
+    if invoice_ids:
+        group(send_invoice_reminder_task.s(invoice_id) for invoice_id in invoice_ids).apply_async()
+    
+    logger.info(f"Bulk invoice reminders: {len(invoice_ids)} queued")
+    return {'queued': len(invoice_ids)}
@@ -0,0 +1,90 @@
+"""
+Pagination utilities for DreamBiz
+Avoids full-table COUNT(*) queries on large, unfiltered list pages
+"""
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_table_count(model, using='default'):
+    """
+    Return the planner's row estimate for a model's table
+
+    Reads table statistics instead of scanning the table, so the result is
+    approximate. Returns None when the backend keeps no usable estimate
+    (e.g. SQLite, or a PostgreSQL table that was never analyzed).
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+
+    if connection.vendor == 'postgresql':
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+    elif connection.vendor == 'mysql':
+        sql = (
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s"
+        )
+    else:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def estimated_query_count(queryset):
+    """
+    Return the planner's row estimate for a filtered queryset
+
+    Asks the database to EXPLAIN the query instead of running it, so the
+    result is approximate. Returns None on backends without a usable
+    estimate (e.g. SQLite).
+    """
+    connection = connections[queryset.db]
+    sql, params = queryset.order_by().query.sql_with_params()
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [column[0] for column in cursor.description]
+            row = dict(zip(columns, cursor.fetchone()))
+        if row.get('rows') is None:
+            return None
+        return int(row['rows'] * float(row.get('filtered') or 100) / 100)
+
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses table statistics for the total on unfiltered querysets
+
+    Filtered querysets, small tables and backends without statistics fall
+    back to the exact COUNT(*), which is cheap in those cases.
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_table_count(queryset.model, using=queryset.db)
+            if estimate is not None and estimate >= self.exact_count_threshold:
+                return estimate
+        return super().count
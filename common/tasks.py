@@ -0,0 +1,26 @@
+"""
+Celery tasks for DreamBiz
+Background versions of the shared email helpers, registered by accuflow.celery
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def send_invoice_reminder_task(invoice_id):
+    """
+    Send the payment reminder for one overdue invoice
+    
+    Returns:
+        bool: True if the email was sent, False otherwise
+    """
+    from .email_utils import get_overdue_invoices, send_invoice_reminder
+    
+    # Re-check on the worker: the invoice may have been paid since it was queued
+    invoice = get_overdue_invoices().filter(pk=invoice_id).first()
+    if invoice is None:
+        logger.info(f"Skipping reminder for invoice {invoice_id}: no longer overdue")
+        return False
+    return send_invoice_reminder(invoice)
@@ -0,0 +1,261 @@
+import json
+from datetime import date
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.db import DatabaseError, connection
+from django.db.models.signals import pre_delete
+from django.test import RequestFactory, TestCase
+
+from accounts.models import Company
+from bank_reconciliation.models import BankAccount, BankStatement, BankTransaction
+from invoicing.models import Customer, Invoice
+
+from . import bulk_operations
+from .bulk_operations import (
+    INVOICE_FIELDS_CONFIG, ExportField, bulk_delete_view, bulk_export_view
+)
+from .pagination import EstimatedCountPaginator, estimated_table_count
+
+User = get_user_model()
+
+# Tests for the shared utilities
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """The planner estimate replaces COUNT(*) only for large unfiltered lists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        account = BankAccount.objects.create(name='Operating', account_number='1001', bank_name='GCB')
+        statement = BankStatement.objects.create(
+            bank_account=account,
+            statement_date=date(2024, 1, 31),
+            beginning_balance=Decimal('0.00'),
+            ending_balance=Decimal('0.00'),
+            statement_period_start=date(2024, 1, 1),
+            statement_period_end=date(2024, 1, 31),
+        )
+        BankTransaction.objects.bulk_create(
+            BankTransaction(
+                bank_statement=statement,
+                transaction_date=date(2024, 1, 15),
+                description=f'Deposit {i}',
+                transaction_type='deposit',
+                amount=Decimal('10.00'),
+            )
+            for i in range(3)
+        )
+
+    def paginator(self, queryset):
+        return EstimatedCountPaginator(queryset.order_by('pk'), 2)
+
+    def test_large_unfiltered_table_uses_the_estimate(self):
+        threshold = EstimatedCountPaginator.exact_count_threshold
+        with mock.patch('common.pagination.estimated_table_count', return_value=threshold):
+            paginator = self.paginator(BankTransaction.objects.all())
+            with self.assertNumQueries(0):
+                self.assertEqual(paginator.count, threshold)
+            self.assertEqual(paginator.num_pages, threshold // 2)
+
+    def test_estimate_below_threshold_counts_exactly(self):
+        estimate = EstimatedCountPaginator.exact_count_threshold - 1
+        with mock.patch('common.pagination.estimated_table_count', return_value=estimate):
+            self.assertEqual(self.paginator(BankTransaction.objects.all()).count, 3)
+
+    def test_missing_estimate_counts_exactly(self):
+        with mock.patch('common.pagination.estimated_table_count', return_value=None):
+            self.assertEqual(self.paginator(BankTransaction.objects.all()).count, 3)
+
+    def test_filtered_queryset_never_asks_for_an_estimate(self):
+        with mock.patch('common.pagination.estimated_table_count') as estimate:
+            paginator = self.paginator(BankTransaction.objects.filter(description='Deposit 1'))
+            self.assertEqual(paginator.count, 1)
+        estimate.assert_not_called()
+
+    def test_plain_lists_are_counted(self):
+        self.assertEqual(EstimatedCountPaginator([1, 2, 3], 2).count, 3)
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite keeps no table statistics')
+    def test_sqlite_has_no_table_estimate(self):
+        self.assertIsNone(estimated_table_count(BankTransaction))
+
+
+class BulkOperationsTestMixin:
+    """Invoices of two users, and POST requests selecting them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner', email='owner@example.com', password='test123')
+        cls.other_user = User.objects.create_user(username='other', email='other@example.com', password='test123')
+        cls.company = Company.objects.create(
+            name='Acme', email='acme@example.com', fiscal_year_start=date(2024, 1, 1)
+        )
+        cls.customer = Customer.objects.create(
+            company=cls.company, user=cls.user, name='Kofi', email='kofi@example.com'
+        )
+
+    def create_invoice(self, number, status='draft', user=None):
+        return Invoice.objects.create(
+            company=self.company, user=user or self.user, customer=self.customer,
+            invoice_number=number, date_due=date(2024, 2, 1), status=status,
+            total_amount=Decimal('100.00'),
+        )
+
+    def post(self, item_ids):
+        request = RequestFactory().post('/', {'item_ids': json.dumps(item_ids)})
+        request.user = self.user
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        return request
+
+    def chunk_per_item(self):
+        """Process the selection one primary key per query."""
+        chunked = bulk_operations.chunked
+        return mock.patch.object(bulk_operations, 'chunked', lambda items: chunked(items, 1))
+
+
+class BulkDeleteTests(BulkOperationsTestMixin, TestCase):
+    """Bulk delete reports what happened to every selected item."""
+
+    def delete(self, item_ids):
+        response = bulk_delete_view(self.post(item_ids), 'invoicing', 'Invoice', 'invoice')
+        return response.status_code, json.loads(response.content)
+
+    def test_blocked_and_missing_items_are_reported_apart(self):
+        draft = self.create_invoice('INV-1')
+        paid = self.create_invoice('INV-2', status='paid')
+        foreign = self.create_invoice('INV-3', user=self.other_user)
+
+        status, payload = self.delete([draft.pk, paid.pk, foreign.pk, 9999])
+
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['deleted_count'], 1)
+        self.assertEqual(payload['skipped_count'], 3)
+        self.assertEqual(payload['blocked_count'], 1)
+        self.assertEqual(payload['missing_count'], 2)
+        self.assertEqual(payload['skipped_names'], ['INV-2'])
+        self.assertFalse(Invoice.objects.filter(pk=draft.pk).exists())
+        self.assertEqual(Invoice.objects.filter(pk__in=[paid.pk, foreign.pk]).count(), 2)
+
+    def test_failed_chunk_rolls_back_the_whole_delete(self):
+        first = self.create_invoice('INV-1')
+        second = self.create_invoice('INV-2')
+
+        def refuse_second(sender, instance, **kwargs):
+            if instance.pk == second.pk:
+                raise DatabaseError('locked')
+
+        pre_delete.connect(refuse_second, sender=Invoice)
+        self.addCleanup(pre_delete.disconnect, refuse_second, sender=Invoice)
+        with self.chunk_per_item():
+            status, payload = self.delete([first.pk, second.pk])
+
+        self.assertEqual(status, 500)
+        self.assertFalse(payload['success'])
+        self.assertEqual(payload['error'], 'Could not delete invoices: locked')
+        self.assertEqual(payload['deleted_count'], 0)
+        self.assertEqual(payload['failed_count'], 2)
+        self.assertEqual(payload['blocked_count'], 0)
+        self.assertEqual(payload['missing_count'], 0)
+        self.assertEqual(Invoice.objects.filter(pk__in=[first.pk, second.pk]).count(), 2)
+
+    def test_duplicate_ids_count_once(self):
+        draft = self.create_invoice('INV-1')
+        paid = self.create_invoice('INV-2', status='paid')
+
+        status, payload = self.delete([draft.pk, draft.pk, paid.pk, paid.pk, 9999, 9999])
+
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['total_requested'], 3)
+        self.assertEqual(payload['deleted_count'], 1)
+        self.assertEqual(payload['skipped_count'], 2)
+        self.assertEqual(payload['blocked_count'], 1)
+        self.assertEqual(payload['missing_count'], 1)
+
+    def test_invalid_selection_is_rejected(self):
+        self.assertEqual(self.delete([])[0], 400)
+        self.assertEqual(self.delete(['abc'])[0], 400)
+        with mock.patch.object(bulk_operations, 'MAX_BULK_ITEMS', 2):
+            self.assertEqual(self.delete([1, 2, 3])[0], 400)
+
+
+class BulkExportTests(BulkOperationsTestMixin, TestCase):
+    """Export failures end in a redirect or, once streaming, a marked file."""
+
+    fields_config = [
+        ('invoice_number', 'Invoice Number', None),
+        ('status', 'Status', None),
+    ]
+
+    def export(self, item_ids, fields_config=None):
+        request = self.post(item_ids)
+        response = bulk_export_view(
+            request, 'invoicing', 'Invoice', 'invoice', fields_config or self.fields_config
+        )
+        return request, response
+
+    def csv_lines(self, response):
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_exports_the_users_selection_newest_first(self):
+        first = self.create_invoice('INV-1')
+        second = self.create_invoice('INV-2', status='paid')
+        foreign = self.create_invoice('INV-3', user=self.other_user)
+
+        with self.chunk_per_item():
+            _, response = self.export([first.pk, second.pk, foreign.pk])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.csv_lines(response),
+            ['Invoice Number,Status', 'INV-2,paid', 'INV-1,draft'],
+        )
+
+    def test_default_invoice_columns(self):
+        invoice = self.create_invoice('INV-1')
+        _, response = self.export([invoice.pk], INVOICE_FIELDS_CONFIG)
+        header, row = self.csv_lines(response)
+        self.assertTrue(header.startswith('Invoice Number,Customer Name'))
+        self.assertTrue(row.startswith('INV-1,Kofi,Acme,kofi@example.com'))
+
+    def test_failure_before_streaming_redirects(self):
+        invoice = self.create_invoice('INV-1')
+        broken_config = [ExportField('invoice_number', 'Invoice Number', None, ('no_such_relation',))]
+
+        request, response = self.export([invoice.pk], broken_config)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(
+            str(next(iter(get_messages(request)))).startswith('Export failed:')
+        )
+
+    def test_failure_while_streaming_marks_the_file_incomplete(self):
+        first = self.create_invoice('INV-1')
+        second = self.create_invoice('INV-2')
+        build_row = bulk_operations.compile_export_row(
+            [ExportField(*config) for config in self.fields_config]
+        )
+        rows_built = []
+
+        def build_one_row(item):
+            if rows_built:
+                raise DatabaseError('connection lost')
+            rows_built.append(item.pk)
+            return build_row(item)
+
+        with self.chunk_per_item(), \
+                mock.patch.object(bulk_operations, 'compile_export_row', return_value=build_one_row):
+            _, response = self.export([first.pk, second.pk])
+            self.assertEqual(response.status_code, 200)
+            with self.assertLogs('common.bulk_operations', 'ERROR'):
+                lines = self.csv_lines(response)
+
+        self.assertEqual(lines, [
+            'Invoice Number,Status',
+            'INV-2,draft',
+            'Export incomplete: stopped after 1 rows because of an error',
+        ])
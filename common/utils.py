@@ -5,6 +5,16 @@ Shared functions used across multiple modules
 
 from decimal import Decimal
 
+from django.http import HttpResponse, JsonResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Inputs of exactly these types take the float fast paths below
+_FLOAT_TYPES = (int, float)
+
 
 def calculate_percentage_change(old_value, new_value):
     """
@@ -17,6 +27,12 @@ def calculate_percentage_change(old_value, new_value):
     Returns:
         float: Percentage change rounded to 2 decimal places
     """
+    # Plain numbers don't need Decimal precision for a percentage
+    if type(old_value) in _FLOAT_TYPES and type(new_value) in _FLOAT_TYPES:
+        if not old_value:
+            return 100 if new_value > 0 else 0
+        return round((new_value - old_value) / old_value * 100, 2)
+    
     # Convert to Decimal for precise calculations
     old_value = Decimal(str(old_value)) if old_value else Decimal('0')
     new_value = Decimal(str(new_value)) if new_value else Decimal('0')
@@ -56,12 +72,54 @@ def safe_divide(numerator, denominator, default=0):
         default: Value to return if denominator is zero
     
     Returns:
-        Decimal: Result of division or default value
+        Decimal: Result of division or default value (float when both
+        numbers are plain ints/floats)
     """
+    if type(numerator) in _FLOAT_TYPES and type(denominator) in _FLOAT_TYPES:
+        if not denominator:
+            return float(default)
+        return numerator / denominator
+    
     numerator = Decimal(str(numerator)) if numerator else Decimal('0')
     denominator = Decimal(str(denominator)) if denominator else Decimal('0')
     
     if denominator == 0:
         return Decimal(str(default))
     
-    return numerator / denominator
\ No newline at end of file
+    return numerator / denominator
+
+
+class Echo:
+    """
+    Pseudo-buffer for streaming CSV responses
+
+    csv.writer writes each row into this object, which hands the encoded
+    line straight back instead of accumulating it, so rows can be yielded
+    to a StreamingHttpResponse one at a time.
+    """
+    
+    def write(self, value):
+        return value
+
+
+def _orjson_default(value):
+    """Serialize what orjson has no native support for, like DjangoJSONEncoder"""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def fast_json_response(data, status=200):
+    """
+    JSON response serialized with orjson when it is installed
+    
+    Produces the same JSON as JsonResponse (Decimals become strings, dates
+    ISO 8601) and falls back to it when orjson is unavailable.
+    """
+    if orjson is None:
+        return JsonResponse(data, status=status)
+    return HttpResponse(
+        orjson.dumps(data, default=_orjson_default),
+        content_type='application/json',
+        status=status
+    )
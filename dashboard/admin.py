@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat
 from django.utils.html import format_html
+from common.bulk_operations import bulk_set_fields
 from .models import DashboardWidget, Notification, QuickAction
 
 
@@ -28,12 +31,22 @@ class DashboardWidgetAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # Let the database build the layout labels shown in the change list
+        return super().get_queryset(request).annotate(
+            _position=Concat(
+                Value('('), 'position_x', Value(', '), 'position_y', Value(')'),
+                output_field=CharField()
+            ),
+            _size=Concat('width', Value(' × '), 'height', output_field=CharField()),
+        )
+    
     def position_display(self, obj):
-        return f"({obj.position_x}, {obj.position_y})"
+        return getattr(obj, '_position', None) or f"({obj.position_x}, {obj.position_y})"
     position_display.short_description = 'Position (X, Y)'
     
     def size_display(self, obj):
-        return f"{obj.width} × {obj.height}"
+        return getattr(obj, '_size', None) or f"{obj.width} × {obj.height}"
     size_display.short_description = 'Size (W × H)'
 
 
@@ -66,8 +79,8 @@ class NotificationAdmin(admin.ModelAdmin):
     
     def mark_as_read(self, request, queryset):
         from django.utils import timezone
-        queryset.update(is_read=True, read_at=timezone.now())
-        self.message_user(request, f"{queryset.count()} notifications marked as read.")
+        updated = bulk_set_fields(queryset, is_read=True, read_at=timezone.now())
+        self.message_user(request, f"{updated} notifications marked as read.")
     mark_as_read.short_description = "Mark selected notifications as read"
 
 
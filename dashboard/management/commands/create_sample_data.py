@@ -1,22 +1,156 @@
+from concurrent.futures import ProcessPoolExecutor
+
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.db import connection, connections, transaction
+from accounts.models import Company, UserCompany
+from dashboard.management.seed_worker import seed_group_worker
 from dashboard.models import DashboardWidget, QuickAction
 from invoicing.models import Customer, Product, Invoice, InvoiceItem
 from expenses.models import ExpenseCategory, Expense
 from decimal import Decimal
+import itertools
 import random
 from datetime import date, timedelta
 
 User = get_user_model()
 
+BULK_BATCH_SIZE = 500
+
+# Every worker holds its own database connection
+MAX_PARALLEL_WORKERS = 8
+
+CUSTOMERS_DATA = [
+    {'name': 'Acme Corporation', 'email': 'billing@acmecorp.com', 'company_name': 'Acme Corp'},
+    {'name': 'TechStart Inc', 'email': 'finance@techstart.com', 'company_name': 'TechStart Inc'},
+    {'name': 'Global Solutions', 'email': 'accounts@globalsolutions.com', 'company_name': 'Global Solutions LLC'},
+    {'name': 'Creative Agency', 'email': 'billing@creativeagency.com', 'company_name': 'Creative Agency Co'},
+]
+
+PRODUCTS_DATA = [
+    {'name': 'Web Development', 'description': 'Custom web development services', 'unit_price': Decimal('150.00')},
+    {'name': 'Consulting Services', 'description': 'Business consulting and strategy', 'unit_price': Decimal('200.00')},
+    {'name': 'Design Services', 'description': 'UI/UX design and branding', 'unit_price': Decimal('125.00')},
+    {'name': 'Maintenance Package', 'description': 'Monthly website maintenance', 'unit_price': Decimal('500.00')},
+]
+
+CATEGORIES_DATA = [
+    {'name': 'Office Supplies', 'color': '#10B981'},
+    {'name': 'Travel & Transportation', 'color': '#3B82F6'},
+    {'name': 'Marketing & Advertising', 'color': '#8B5CF6'},
+    {'name': 'Software & Subscriptions', 'color': '#F59E0B'},
+    {'name': 'Meals & Entertainment', 'color': '#EF4444'},
+]
+
+EXPENSES_DATA = [
+    {'description': 'Office chair and desk supplies', 'amount': Decimal('245.99')},
+    {'description': 'Business lunch with client', 'amount': Decimal('89.50')},
+    {'description': 'Adobe Creative Suite subscription', 'amount': Decimal('52.99')},
+    {'description': 'Uber rides for business meetings', 'amount': Decimal('127.30')},
+    {'description': 'Google Ads campaign', 'amount': Decimal('350.00')},
+]
+
+DEFAULT_WIDGETS = [
+    {'widget_type': 'revenue_chart', 'title': 'Revenue Trend', 'position_x': 0, 'position_y': 0, 'width': 8, 'height': 4},
+    {'widget_type': 'kpi_metrics', 'title': 'Key Metrics', 'position_x': 8, 'position_y': 0, 'width': 4, 'height': 4},
+    {'widget_type': 'recent_transactions', 'title': 'Recent Activity', 'position_x': 0, 'position_y': 4, 'width': 6, 'height': 4},
+    {'widget_type': 'ai_insights', 'title': 'AI Insights', 'position_x': 6, 'position_y': 4, 'width': 6, 'height': 4},
+]
+
+QUICK_ACTIONS_DATA = [
+    {'name': 'Create Invoice', 'url': '/invoicing/invoices/create/', 'icon': 'fas fa-file-invoice', 'color': 'blue', 'order': 0},
+    {'name': 'Add Expense', 'url': '/expenses/create/', 'icon': 'fas fa-receipt', 'color': 'green', 'order': 1},
+    {'name': 'Add Customer', 'url': '/invoicing/customers/create/', 'icon': 'fas fa-user-plus', 'color': 'purple', 'order': 2},
+    {'name': 'View Reports', 'url': '/reports/', 'icon': 'fas fa-chart-bar', 'color': 'orange', 'order': 3},
+]
+
+# Seed groups that do not depend on each other:
+# name -> (model, key field, rows, label, label field, company scoped)
+SEED_GROUPS = {
+    'customers': (Customer, 'email', CUSTOMERS_DATA, 'customer', 'name', True),
+    'products': (Product, 'name', PRODUCTS_DATA, 'product', 'name', True),
+    'categories': (ExpenseCategory, 'name', CATEGORIES_DATA, 'expense category', 'name', True),
+    'widgets': (DashboardWidget, 'widget_type', DEFAULT_WIDGETS, 'dashboard widget', 'title', False),
+    'quick_actions': (QuickAction, 'name', QUICK_ACTIONS_DATA, 'quick action', 'name', False),
+}
+
+
+def seed_group(group, user_id, company_id):
+    """
+    Insert the rows of a seed group whose key is not yet used by the user
+    (in the company, for company-scoped models)
+
+    Replaces one get_or_create() per row with a single lookup of the
+    existing keys and one bulk INSERT.
+
+    Returns:
+        list: Labels of the rows that were created
+    """
+    model, key_field, rows, _label, label_field, company_scoped = SEED_GROUPS[group]
+    owner = {'user_id': user_id}
+    if company_scoped:
+        owner['company_id'] = company_id
+    existing = set(model.objects.filter(**owner).values_list(key_field, flat=True))
+    new_objects = [
+        model(**owner, **row) for row in rows if row[key_field] not in existing
+    ]
+    model.objects.bulk_create(new_objects, ignore_conflicts=True, batch_size=BULK_BATCH_SIZE)
+    return [getattr(obj, label_field) for obj in new_objects]
+
 
 class Command(BaseCommand):
     help = 'Populate the database with sample data for demonstration'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--parallel', type=int, default=1,
+            help=(
+                'Seed independent models in this many worker processes '
+                f'(max {MAX_PARALLEL_WORKERS}). Each group then commits on its '
+                'own instead of in a single transaction.'
+            )
+        )
+
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('Creating sample data...'))
-        
-        # Create a demo user if it doesn't exist
+
+        parallel = min(max(options['parallel'], 1), MAX_PARALLEL_WORKERS)
+        if parallel > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite allows a single writer at a time; seeding sequentially.'
+            ))
+            parallel = 1
+
+        if parallel > 1:
+            with transaction.atomic():
+                user = self.create_demo_user()
+                company = self.create_demo_company(user)
+            self.seed_groups_in_parallel(user, company, parallel)
+            with transaction.atomic():
+                self.create_invoices(user, company)
+                self.create_expenses(user, company)
+        else:
+            # Commit every insert at once instead of once per statement
+            with transaction.atomic():
+                user = self.create_demo_user()
+                company = self.create_demo_company(user)
+                for group in SEED_GROUPS:
+                    self.report_created(group, seed_group(group, user.id, company.id))
+                self.create_invoices(user, company)
+                self.create_expenses(user, company)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                'Sample data created successfully!\n\n'
+                'You can now login with:\n'
+                'Username: demo\n'
+                'Password: demo123\n\n'
+                'Or use the admin user you created.'
+            )
+        )
+
+    def create_demo_user(self):
+        """Create a demo user if it doesn't exist"""
         user, created = User.objects.get_or_create(
             username='demo',
             defaults={
@@ -30,154 +164,121 @@ class Command(BaseCommand):
             user.set_password('demo123')
             user.save()
             self.stdout.write(self.style.SUCCESS(f'Created demo user: {user.username}'))
+        return user
 
-        # Create sample customers
-        customers_data = [
-            {'name': 'Acme Corporation', 'email': 'billing@acmecorp.com', 'company': 'Acme Corp'},
-            {'name': 'TechStart Inc', 'email': 'finance@techstart.com', 'company': 'TechStart Inc'},
-            {'name': 'Global Solutions', 'email': 'accounts@globalsolutions.com', 'company': 'Global Solutions LLC'},
-            {'name': 'Creative Agency', 'email': 'billing@creativeagency.com', 'company': 'Creative Agency Co'},
-        ]
-        
-        for customer_data in customers_data:
-            customer, created = Customer.objects.get_or_create(
-                user=user,
-                email=customer_data['email'],
-                defaults=customer_data
-            )
-            if created:
-                self.stdout.write(f'Created customer: {customer.name}')
-
-        # Create sample products/services
-        products_data = [
-            {'name': 'Web Development', 'description': 'Custom web development services', 'unit_price': Decimal('150.00')},
-            {'name': 'Consulting Services', 'description': 'Business consulting and strategy', 'unit_price': Decimal('200.00')},
-            {'name': 'Design Services', 'description': 'UI/UX design and branding', 'unit_price': Decimal('125.00')},
-            {'name': 'Maintenance Package', 'description': 'Monthly website maintenance', 'unit_price': Decimal('500.00')},
-        ]
-        
-        for product_data in products_data:
-            product, created = Product.objects.get_or_create(
-                user=user,
-                name=product_data['name'],
-                defaults=product_data
-            )
-            if created:
-                self.stdout.write(f'Created product: {product.name}')
-
-        # Create sample expense categories
-        categories_data = [
-            {'name': 'Office Supplies', 'color': '#10B981'},
-            {'name': 'Travel & Transportation', 'color': '#3B82F6'},
-            {'name': 'Marketing & Advertising', 'color': '#8B5CF6'},
-            {'name': 'Software & Subscriptions', 'color': '#F59E0B'},
-            {'name': 'Meals & Entertainment', 'color': '#EF4444'},
-        ]
-        
-        for category_data in categories_data:
-            category, created = ExpenseCategory.objects.get_or_create(
-                user=user,
-                name=category_data['name'],
-                defaults=category_data
-            )
-            if created:
-                self.stdout.write(f'Created expense category: {category.name}')
-
-        # Create sample invoices
-        customers = Customer.objects.filter(user=user)
-        products = Product.objects.filter(user=user)
-        
-        if customers.exists() and products.exists():
-            for i in range(10):
-                customer = random.choice(customers)
-                invoice = Invoice.objects.create(
-                    user=user,
-                    customer=customer,
-                    invoice_number=f'INV-{1000 + i:05d}',
-                    date_due=date.today() + timedelta(days=30),
-                    status=random.choice(['draft', 'sent', 'paid']),
-                    total_amount=Decimal('0')
-                )
-                
-                # Add random line items
-                for j in range(random.randint(1, 3)):
-                    product = random.choice(products)
-                    quantity = random.randint(1, 10)
-                    InvoiceItem.objects.create(
-                        invoice=invoice,
-                        product=product,
-                        description=product.description,
-                        quantity=quantity,
-                        unit_price=product.unit_price
-                    )
-                
-                invoice.calculate_totals()
-                self.stdout.write(f'Created invoice: {invoice.invoice_number}')
-
-        # Create sample expenses
-        categories = ExpenseCategory.objects.filter(user=user)
-        
-        if categories.exists():
-            expenses_data = [
-                {'description': 'Office chair and desk supplies', 'amount': Decimal('245.99')},
-                {'description': 'Business lunch with client', 'amount': Decimal('89.50')},
-                {'description': 'Adobe Creative Suite subscription', 'amount': Decimal('52.99')},
-                {'description': 'Uber rides for business meetings', 'amount': Decimal('127.30')},
-                {'description': 'Google Ads campaign', 'amount': Decimal('350.00')},
-            ]
-            
-            for expense_data in expenses_data:
-                Expense.objects.create(
-                    user=user,
-                    category=random.choice(categories),
-                    description=expense_data['description'],
-                    amount=expense_data['amount'],
-                    date=date.today() - timedelta(days=random.randint(1, 30)),
-                    payment_method='credit_card',
-                    status='approved'
-                )
-                self.stdout.write(f'Created expense: {expense_data["description"]}')
-
-        # Create default dashboard widgets
-        default_widgets = [
-            {'widget_type': 'revenue_chart', 'title': 'Revenue Trend', 'position_x': 0, 'position_y': 0, 'width': 8, 'height': 4},
-            {'widget_type': 'kpi_metrics', 'title': 'Key Metrics', 'position_x': 8, 'position_y': 0, 'width': 4, 'height': 4},
-            {'widget_type': 'recent_transactions', 'title': 'Recent Activity', 'position_x': 0, 'position_y': 4, 'width': 6, 'height': 4},
-            {'widget_type': 'ai_insights', 'title': 'AI Insights', 'position_x': 6, 'position_y': 4, 'width': 6, 'height': 4},
-        ]
-        
-        for widget_data in default_widgets:
-            widget, created = DashboardWidget.objects.get_or_create(
-                user=user,
-                widget_type=widget_data['widget_type'],
-                defaults=widget_data
-            )
-            if created:
-                self.stdout.write(f'Created dashboard widget: {widget.title}')
-
-        # Create quick actions
-        quick_actions_data = [
-            {'name': 'Create Invoice', 'url': '/invoicing/invoices/create/', 'icon': 'fas fa-file-invoice', 'color': 'blue'},
-            {'name': 'Add Expense', 'url': '/expenses/create/', 'icon': 'fas fa-receipt', 'color': 'green'},
-            {'name': 'Add Customer', 'url': '/invoicing/customers/create/', 'icon': 'fas fa-user-plus', 'color': 'purple'},
-            {'name': 'View Reports', 'url': '/reports/', 'icon': 'fas fa-chart-bar', 'color': 'orange'},
-        ]
-        
-        for i, action_data in enumerate(quick_actions_data):
-            action, created = QuickAction.objects.get_or_create(
+    def create_demo_company(self, user):
+        """Return the demo user's company, creating it on the first run"""
+        assignment = UserCompany.objects.filter(user=user).select_related('company').first()
+        if assignment:
+            return assignment.company
+
+        company = Company.objects.create(
+            name='Demo Company',
+            email=user.email,
+            fiscal_year_start=date(date.today().year, 1, 1),
+            created_by=user
+        )
+        UserCompany.objects.create(user=user, company=company, role='admin')
+        self.stdout.write(self.style.SUCCESS(f'Created demo company: {company.name}'))
+        return company
+
+    def seed_groups_in_parallel(self, user, company, workers):
+        """Run the independent seed groups across a pool of worker processes"""
+        # Forked workers must not share the parent's open connections; spawned
+        # ones import the worker module and set Django up themselves
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                group: executor.submit(seed_group_worker, group, user.id, company.id)
+                for group in SEED_GROUPS
+            }
+            for group, future in futures.items():
+                self.report_created(group, future.result())
+
+    def report_created(self, group, labels):
+        label = SEED_GROUPS[group][3]
+        for name in labels:
+            self.stdout.write(f'Created {label}: {name}')
+
+    def create_invoices(self, user, company):
+        """Create sample invoices with random line items"""
+        # Load the choices once, since random.choice() on a queryset runs a
+        # COUNT and an indexed fetch per pick
+        customers = list(Customer.objects.filter(user=user, company=company))
+        products = list(Product.objects.filter(user=user, company=company))
+
+        if not (customers and products):
+            return
+
+        invoice_customers = random.choices(customers, k=10)
+        item_counts = [random.randint(1, 3) for _ in invoice_customers]
+        item_products = iter(random.choices(products, k=sum(item_counts)))
+
+        invoices = []
+        invoice_items = []
+        for i, (customer, item_count) in enumerate(zip(invoice_customers, item_counts)):
+            # Add random line items
+            items = []
+            for product in itertools.islice(item_products, item_count):
+                quantity = random.randint(1, 10)
+                items.append(InvoiceItem(
+                    product=product,
+                    description=product.description,
+                    quantity=quantity,
+                    unit_price=product.unit_price
+                ))
+
+            # Same sum as calculate_totals(), done before the insert so no
+            # per-invoice SUM query or UPDATE is needed
+            subtotal = sum(item.total for item in items)
+            invoices.append(Invoice(
+                company=company,
                 user=user,
-                name=action_data['name'],
-                defaults={**action_data, 'order': i}
-            )
-            if created:
-                self.stdout.write(f'Created quick action: {action.name}')
+                customer=customer,
+                invoice_number=f'INV-{1000 + i:05d}',
+                date_due=date.today() + timedelta(days=30),
+                status=random.choice(['draft', 'sent', 'paid']),
+                subtotal=subtotal,
+                total_amount=subtotal
+            ))
+            invoice_items.append(items)
 
-        self.stdout.write(
-            self.style.SUCCESS(
-                'Sample data created successfully!\n\n'
-                'You can now login with:\n'
-                'Username: demo\n'
-                'Password: demo123\n\n'
-                'Or use the admin user you created.'
-            )
+        if connection.features.can_return_rows_from_bulk_insert:
+            Invoice.objects.bulk_create(invoices, batch_size=BULK_BATCH_SIZE)
+        else:
+            # Without RETURNING (e.g. MySQL) the new ids are needed for the items
+            for invoice in invoices:
+                invoice.save()
+
+        for invoice, items in zip(invoices, invoice_items):
+            for item in items:
+                item.invoice = invoice
+        InvoiceItem.objects.bulk_create(
+            [item for items in invoice_items for item in items],
+            batch_size=BULK_BATCH_SIZE
         )
+        for invoice in invoices:
+            self.stdout.write(f'Created invoice: {invoice.invoice_number}')
+
+    def create_expenses(self, user, company):
+        """Create sample expenses in the user's categories"""
+        categories = list(ExpenseCategory.objects.filter(user=user, company=company))
+
+        if not categories:
+            return
+
+        Expense.objects.bulk_create([
+            Expense(
+                company=company,
+                user=user,
+                category=random.choice(categories),
+                description=expense_data['description'],
+                amount=expense_data['amount'],
+                date=date.today() - timedelta(days=random.randint(1, 30)),
+                payment_method='credit_card',
+                status='approved'
+            )
+            for expense_data in EXPENSES_DATA
+        ], batch_size=BULK_BATCH_SIZE)
+        for expense_data in EXPENSES_DATA:
+            self.stdout.write(f'Created expense: {expense_data["description"]}')
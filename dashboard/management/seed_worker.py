@@ -0,0 +1,18 @@
+"""
+Worker process entry point for create_sample_data --parallel
+
+Under the spawn and forkserver start methods a worker imports this module to
+unpickle its task before Django is set up, so nothing here may import models
+at module level; they are imported once django.setup() has run.
+"""
+import django
+
+
+def seed_group_worker(group, user_id, company_id):
+    """Run one seed group in a worker process, on its own connection."""
+    django.setup()
+    from django.db import transaction
+    from dashboard.management.commands.create_sample_data import seed_group
+
+    with transaction.atomic():
+        return seed_group(group, user_id, company_id)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_notification_user_unread_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dashboardwidget',
+            index=models.Index(fields=['user', 'is_visible', 'position_y', 'position_x'], name='dash_widget_user_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quickaction',
+            index=models.Index(fields=['user', 'is_active', 'order'], name='dash_qa_user_active_idx'),
+        ),
+    ]
@@ -1,8 +1,47 @@
+from django.core.cache import cache
 from django.db import models
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+DASHBOARD_METRICS_TTL = 300
+
+
+def _metrics_generation_key(user_id, company_id):
+    # Company dashboards are shared by every member; personal ones by nobody
+    scope = f'company:{company_id}' if company_id else f'user:{user_id}'
+    return f'dash_metrics_gen:{scope}'
+
+
+def dashboard_metrics_cache_key(user_id, company_id, month_start):
+    """
+    Cache key for the dashboard metrics a user sees for a company in a month
+
+    Includes a generation number that bump_dashboard_metrics() increments, so
+    every cached copy for a company goes stale at once without having to
+    know which users cached one.
+    """
+    generation = cache.get(_metrics_generation_key(user_id, company_id), 0)
+    return f'dash_metrics:{user_id}:{company_id or 0}:{month_start.isoformat()}:{generation}'
+
+
+def bump_dashboard_metrics(user_id, company_id):
+    """
+    Invalidate the cached metrics of a company and of the owner's personal view
+    
+    Records without an owner (``user_id`` None) only expire the company's.
+    """
+    keys = {_metrics_generation_key(user_id, company_id)}
+    if user_id is not None:
+        keys.add(_metrics_generation_key(user_id, None))
+    for key in keys:
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, None)
+
 
 class DashboardWidget(models.Model):
     """
@@ -38,6 +77,10 @@ class DashboardWidget(models.Model):
 
     class Meta:
         ordering = ['position_y', 'position_x']
+        indexes = [
+            # Visible widgets per user in layout order
+            models.Index(fields=['user', 'is_visible', 'position_y', 'position_x'], name='dash_widget_user_visible_idx'),
+        ]
 
 
 class Notification(models.Model):
@@ -78,6 +121,10 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Unread notifications per user, newest first
+            models.Index(fields=['user', 'is_read', '-created_at'], name='dash_notif_user_unread_idx'),
+        ]
 
 
 class QuickAction(models.Model):
@@ -101,3 +148,48 @@ class QuickAction(models.Model):
 
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            # Active quick actions per user in display order
+            models.Index(fields=['user', 'is_active', 'order'], name='dash_qa_user_active_idx'),
+        ]
+
+
+DASHBOARD_LAYOUT_CACHE_TIMEOUT = 300
+
+# Columns the dashboard renders; the rest stay out of the rows and the cache
+DASHBOARD_WIDGET_FIELDS = (
+    'id', 'widget_type', 'title', 'position_x', 'position_y', 'width', 'height', 'settings',
+)
+DASHBOARD_QUICK_ACTION_FIELDS = ('id', 'name', 'description', 'icon', 'url', 'color', 'order')
+DASHBOARD_NOTIFICATION_FIELDS = (
+    'id', 'type', 'title', 'message', 'priority', 'action_url', 'action_text', 'created_at',
+)
+
+
+def dashboard_layout_cache_key(user_id):
+    return f'dash_layout:{user_id}'
+
+
+def get_dashboard_layout(user_id):
+    """
+    Return the user's visible widgets and first eight active quick actions.
+    
+    Both only change when the user customizes the dashboard but are read on
+    every dashboard load, so they are cached together and dropped by the
+    DashboardWidget/QuickAction save/delete signals.
+    """
+    return cache.get_or_set(
+        dashboard_layout_cache_key(user_id),
+        lambda: (
+            list(
+                DashboardWidget.objects.filter(user_id=user_id, is_visible=True)
+                .only(*DASHBOARD_WIDGET_FIELDS)
+            ),
+            list(
+                QuickAction.objects.filter(user_id=user_id, is_active=True)
+                .only(*DASHBOARD_QUICK_ACTION_FIELDS)
+                .order_by('order')[:8]
+            ),
+        ),
+        DASHBOARD_LAYOUT_CACHE_TIMEOUT,
+    )
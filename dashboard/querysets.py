@@ -0,0 +1,34 @@
+"""
+Querysets scoped to what a dashboard user may see
+"""
+from expenses.models import Expense
+from inventory.models import Product
+from invoicing.models import Customer, Invoice
+
+
+def scoped_querysets(user, company):
+    """
+    Invoice, expense, customer and product querysets for the dashboard
+
+    Scoped to the active company when there is one, otherwise to the user's
+    own records. Querysets are lazy, so unused ones cost nothing.
+
+    Returns:
+        tuple: (invoice_qs, expense_qs, customer_qs, product_qs)
+    """
+    if company:
+        return (
+            Invoice.objects.filter(company=company),
+            Expense.objects.filter(company=company),
+            Customer.objects.filter(company=company),
+            Product.objects.filter(company=company),
+        )
+
+    # Product model only has company field, so filter by user's companies
+    user_companies = user.companies.all() if hasattr(user, 'companies') else []
+    return (
+        Invoice.objects.filter(user=user),
+        Expense.objects.filter(user=user),
+        Customer.objects.filter(user=user),
+        Product.objects.filter(company__in=user_companies),
+    )
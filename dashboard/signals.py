@@ -0,0 +1,49 @@
+"""
+Django signals for the dashboard
+Drops cached dashboard metrics when the invoices, expenses, customers,
+products or stock movements behind them change and the cached layout when
+widgets or quick actions change
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from expenses.models import Expense
+from inventory.models import Product, StockMovement
+from invoicing.models import Customer, Invoice
+
+from .models import (
+    DashboardWidget, QuickAction, bump_dashboard_metrics, dashboard_layout_cache_key
+)
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_delete, sender=Invoice)
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_dashboard_metrics(sender, instance, **kwargs):
+    """Expire cached metrics for the company and the owner's personal view."""
+    bump_dashboard_metrics(instance.user_id, instance.company_id)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=StockMovement)
+@receiver(post_delete, sender=StockMovement)
+def invalidate_dashboard_inventory(sender, instance, **kwargs):
+    """
+    Expire cached metrics for the company; inventory only feeds the company
+    dashboard's product figures.
+    """
+    bump_dashboard_metrics(None, instance.company_id)
+
+
+@receiver(post_save, sender=DashboardWidget)
+@receiver(post_delete, sender=DashboardWidget)
+@receiver(post_save, sender=QuickAction)
+@receiver(post_delete, sender=QuickAction)
+def invalidate_dashboard_layout(sender, instance, **kwargs):
+    """Forget the owner's cached widgets and quick actions."""
+    cache.delete(dashboard_layout_cache_key(instance.user_id))
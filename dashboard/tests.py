@@ -1,4 +1,91 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Company, UserCompany
+from expenses.models import Expense
+from invoicing.models import Customer, Invoice
+
+User = get_user_model()
 
 # Tests for dashboard functionality
-# Add test cases here as needed
+
+
+class ChartETagTests(TestCase):
+    """Chart endpoints answer 304 while their rows are unchanged."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner', email='owner@example.com', password='test123')
+        cls.company = Company.objects.create(
+            name='Acme', email='acme@example.com', fiscal_year_start=date(2024, 1, 1)
+        )
+        UserCompany.objects.create(user=cls.user, company=cls.company, role='admin')
+        cls.customer = Customer.objects.create(
+            company=cls.company, user=cls.user, name='Kofi', email='kofi@example.com'
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        session = self.client.session
+        session['active_company_id'] = self.company.pk
+        session.save()
+
+    def create_paid_invoice(self, number):
+        return Invoice.objects.create(
+            company=self.company, user=self.user, customer=self.customer,
+            invoice_number=number, date_due=timezone.now().date(), status='paid',
+            total_amount=Decimal('100.00'),
+        )
+
+    def create_expense(self, amount='25.00'):
+        return Expense.objects.create(
+            company=self.company, user=self.user, description='Fuel',
+            amount=Decimal(amount), date=timezone.now().date(),
+        )
+
+    def assertRevalidates(self, url, change):
+        """The ETag answers 304 until ``change()`` runs, then a new ETag is served."""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_revenue_chart_revalidates_until_an_invoice_is_paid(self):
+        self.create_paid_invoice('INV-1')
+        self.assertRevalidates(
+            reverse('dashboard:revenue_chart_data'),
+            lambda: self.create_paid_invoice('INV-2'),
+        )
+
+    def test_revenue_chart_changes_when_an_invoice_is_edited(self):
+        invoice = self.create_paid_invoice('INV-1')
+
+        def edit():
+            invoice.total_amount = Decimal('150.00')
+            invoice.save()
+        self.assertRevalidates(reverse('dashboard:revenue_chart_data'), edit)
+
+    def test_expense_chart_revalidates_until_an_expense_is_deleted(self):
+        self.create_expense()
+        expense = self.create_expense('10.00')
+        self.assertRevalidates(reverse('dashboard:expense_chart_data'), expense.delete)
+
+    def test_chart_window_is_part_of_the_etag(self):
+        url = reverse('dashboard:expense_chart_data')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, {'days': 7}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']), 8)
@@ -1,197 +1,195 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponse
-from django.db.models import Sum, Count, Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum, Count, Max, Q, F, Value, CharField, DecimalField, FloatField
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
-from django.contrib.humanize.templatetags.humanize import naturaltime
+from django.views.decorators.http import condition
 from datetime import timedelta, datetime
 import csv
 import json
 from decimal import Decimal
-from .models import DashboardWidget, Notification, QuickAction
-from invoicing.models import Invoice, Customer
+from .querysets import scoped_querysets
+from .models import (
+    DASHBOARD_METRICS_TTL, DASHBOARD_NOTIFICATION_FIELDS, DashboardWidget, Notification,
+    dashboard_layout_cache_key, dashboard_metrics_cache_key, get_dashboard_layout
+)
+from invoicing.models import Invoice
 from expenses.models import Expense
 from sales.models import Lead
 from inventory.models import Product, StockMovement
-from common.utils import calculate_percentage_change
+from common.utils import Echo, calculate_percentage_change, fast_json_response
 
 
+# Layout fields the customization view may change
+WIDGET_LAYOUT_FIELDS = ['position_x', 'position_y', 'width', 'height']
 
-@login_required
-def dashboard_home(request):
+# (seconds, unit) from the largest unit down, for relative times
+TIME_AGO_UNITS = (
+    (365 * 86400, 'year'),
+    (30 * 86400, 'month'),
+    (7 * 86400, 'week'),
+    (86400, 'day'),
+    (3600, 'hour'),
+    (60, 'minute'),
+)
+
+
+def _time_ago(delta):
     """
-    Main dashboard view with customizable widgets
-    Much more flexible than QuickBooks' static dashboard
+    Describe a timedelta as "3 hours ago" or "2 days from now"
+
+    Plain arithmetic on the largest whole unit, used instead of naturaltime()
+    for per-row labels in JSON responses.
     """
-    # Get user's dashboard widgets
-    widgets = DashboardWidget.objects.filter(user=request.user, is_visible=True)
-    
-    # Get recent notifications
-    notifications = Notification.objects.filter(
-        user=request.user, 
-        is_read=False
-    ).order_by('-created_at')[:5]
-    
-    # Get quick actions
-    quick_actions = QuickAction.objects.filter(
-        user=request.user, 
-        is_active=True
-    ).order_by('order')[:8]
-    
-    # Calculate key metrics with company context
-    today = timezone.now().date()
+    seconds = int(delta.total_seconds())
+    suffix = 'ago' if seconds >= 0 else 'from now'
+    seconds = abs(seconds)
+    for unit_seconds, unit in TIME_AGO_UNITS:
+        if seconds >= unit_seconds:
+            count = seconds // unit_seconds
+            return f"{count} {unit}{'s' if count != 1 else ''} {suffix}"
+    return 'now'
+
+
+def _recent_activity_rows(invoice_qs, expense_qs, limit):
+    """
+    Latest invoices and expenses as one list of dicts, newest first
+
+    Both sources are merged with a UNION so the database does the sorting and
+    the limit. On equal dates invoices come before expenses.
+    """
+    invoices = invoice_qs.order_by().values(
+        activity_id=F('id'),
+        kind=Value('invoice', output_field=CharField()),
+        label=F('invoice_number'),
+        customer_name=F('customer__name'),
+        status_code=F('status'),
+        activity_amount=F('total_amount'),
+        activity_date=F('date_created'),
+    )
+    expenses = expense_qs.order_by().values(
+        activity_id=F('id'),
+        kind=Value('expense', output_field=CharField()),
+        label=F('description'),
+        customer_name=Value('', output_field=CharField()),
+        status_code=Value('', output_field=CharField()),
+        activity_amount=F('amount'),
+        activity_date=F('date'),
+    )
+    return invoices.union(expenses, all=True).order_by('-activity_date', '-kind')[:limit]
+
+
+def _compute_metrics(user, company, today):
+    """Key metrics, recent activity and product statistics for the dashboard"""
     month_start = today.replace(day=1)
-    company = getattr(request, 'company', None)
-    
+
     # Base querysets with company filter
-    if company:
-        invoice_qs = Invoice.objects.filter(company=company)
-        expense_qs = Expense.objects.filter(company=company)
-        customer_qs = Customer.objects.filter(company=company)
-        product_qs = Product.objects.filter(company=company)
-    else:
-        # Fallback to user filtering where available
-        invoice_qs = Invoice.objects.filter(user=request.user)
-        expense_qs = Expense.objects.filter(user=request.user) if hasattr(Expense._meta.get_field('user'), 'related_model') else Expense.objects.none()
-        customer_qs = Customer.objects.filter(user=request.user)
-        # Product model only has company field, so filter by user's companies
-        user_companies = request.user.companies.all() if hasattr(request.user, 'companies') else []
-        product_qs = Product.objects.filter(company__in=user_companies)
-    
-    # Revenue metrics
-    monthly_revenue = invoice_qs.filter(
-        date_created__gte=month_start,
-        status='paid'
-    ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
-    
-    # Previous month for comparison
+    invoice_qs, expense_qs, customer_qs, product_qs = scoped_querysets(user, company)
+
+    # Revenue metrics, with the previous month for comparison, in one query
     prev_month_start = (month_start - timedelta(days=1)).replace(day=1)
-    prev_monthly_revenue = invoice_qs.filter(
+    revenue = invoice_qs.filter(
         date_created__gte=prev_month_start,
-        date_created__lt=month_start,
         status='paid'
-    ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
-    
+    ).aggregate(
+        current=Sum('total_amount', filter=Q(date_created__gte=month_start)),
+        previous=Sum('total_amount', filter=Q(date_created__lt=month_start)),
+    )
+    monthly_revenue = revenue['current'] or Decimal('0')
+    prev_monthly_revenue = revenue['previous'] or Decimal('0')
+
     # Expense metrics
-    monthly_expenses = expense_qs.filter(
-        date__gte=month_start
-    ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-    
-    prev_monthly_expenses = expense_qs.filter(
-        date__gte=prev_month_start,
-        date__lt=month_start
-    ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-    
+    expenses = expense_qs.filter(
+        date__gte=prev_month_start
+    ).aggregate(
+        current=Sum('amount', filter=Q(date__gte=month_start)),
+        previous=Sum('amount', filter=Q(date__lt=month_start)),
+    )
+    monthly_expenses = expenses['current'] or Decimal('0')
+    prev_monthly_expenses = expenses['previous'] or Decimal('0')
+
     # Recent activity - last 10 activities
     recent_activities = []
-    
-    # Recent invoices
-    recent_invoices = invoice_qs.order_by('-date_created')[:5]
-    for invoice in recent_invoices:
-        recent_activities.append({
-            'type': 'invoice',
-            'icon': 'fas fa-file-invoice',
-            'color': 'green' if invoice.status == 'paid' else 'blue',
-            'title': f'Invoice #{invoice.invoice_number}',
-            'description': f'Created for {invoice.customer.name}' if invoice.customer else 'Created',
-            'amount': invoice.total_amount,
-            'date': invoice.date_created,
-            'url': f'/invoicing/invoices/{invoice.id}/'
-        })
-    
-    # Recent expenses
-    recent_expenses = expense_qs.order_by('-date')[:5]
-    for expense in recent_expenses:
-        recent_activities.append({
-            'type': 'expense',
-            'icon': 'fas fa-receipt',
-            'color': 'red',
-            'title': expense.description[:50],
-            'description': f'Expense recorded',
-            'amount': expense.amount,
-            'date': expense.date,
-            'url': f'/expenses/{expense.id}/'
-        })
-    
-    # Sort activities by date
-    recent_activities.sort(key=lambda x: x['date'], reverse=True)
-    recent_activities = recent_activities[:10]
-    
+    for row in _recent_activity_rows(invoice_qs, expense_qs, 10):
+        if row['kind'] == 'invoice':
+            recent_activities.append({
+                'type': 'invoice',
+                'icon': 'fas fa-file-invoice',
+                'color': 'green' if row['status_code'] == 'paid' else 'blue',
+                'title': f'Invoice #{row["label"]}',
+                'description': f'Created for {row["customer_name"]}' if row['customer_name'] else 'Created',
+                'amount': row['activity_amount'],
+                'date': row['activity_date'],
+                'url': f'/invoicing/invoices/{row["activity_id"]}/'
+            })
+        else:
+            recent_activities.append({
+                'type': 'expense',
+                'icon': 'fas fa-receipt',
+                'color': 'red',
+                'title': row['label'][:50],
+                'description': 'Expense recorded',
+                'amount': row['activity_amount'],
+                'date': row['activity_date'],
+                'url': f'/expenses/{row["activity_id"]}/'
+            })
+
     # Calculate percentage changes
     revenue_change = calculate_percentage_change(prev_monthly_revenue, monthly_revenue)
     expense_change = calculate_percentage_change(prev_monthly_expenses, monthly_expenses)
-    
+
     # Outstanding invoices
-    outstanding_invoices = Invoice.objects.filter(
-        user=request.user,
+    outstanding_invoices = invoice_qs.filter(
         status__in=['sent', 'overdue']
     ).aggregate(
         total=Sum('total_amount'),
         count=Count('id')
     )
-    
+
     # Additional metrics
     total_customers = customer_qs.count()
     total_products = product_qs.filter(is_active=True).count()
-    
+
     # Product Statistics
     product_stats = {}
     if company:
         from inventory.models import StockMovement
-        
-        # Calculate total inventory value
-        total_inventory_value = Decimal('0.00')
-        low_stock_count = 0
-        out_of_stock_count = 0
-        
-        active_products = product_qs.filter(is_active=True)
-        for product in active_products:
-            current_stock = product.current_stock
-            stock_value = current_stock * product.cost_price
-            total_inventory_value += stock_value
-            
-            if current_stock <= 0:
-                out_of_stock_count += 1
-            elif current_stock <= product.reorder_point:
-                low_stock_count += 1
-        
+    
+        # Calculate total inventory value and stock levels
+        inventory = _inventory_summary(product_qs.filter(is_active=True))
+    
         # Stock movement statistics for current month
-        stock_movements_this_month = StockMovement.objects.filter(
-            company=company,
-            movement_date__gte=month_start
+        monthly_stock_in, monthly_stock_out = _stock_flow(
+            StockMovement.objects.filter(company=company, movement_date__gte=month_start)
         )
-        
-        monthly_stock_in = stock_movements_this_month.filter(
-            quantity_change__gt=0
-        ).aggregate(total=Sum('quantity_change'))['total'] or 0
-        
-        monthly_stock_out = stock_movements_this_month.filter(
-            quantity_change__lt=0
-        ).aggregate(total=Sum('quantity_change'))['total'] or 0
-        
+    
         # Top selling products this month
-        top_selling_products = product_qs.filter(
-            stock_movements__movement_date__gte=month_start,
-            stock_movements__movement_type='sale'
-        ).annotate(
-            units_sold=Sum('stock_movements__quantity_change')
-        ).order_by('units_sold')[:5]  # Negative values, so ascending order
-        
+        # Sales are stored as negative quantity changes
+        top_selling_products = product_qs.annotate(
+            units_sold=Coalesce(-Sum(
+                'stock_movements__quantity_change',
+                filter=Q(
+                    stock_movements__movement_type='sale',
+                    stock_movements__movement_date__gte=month_start
+                )
+            ), 0)
+        ).filter(units_sold__gt=0).order_by('-units_sold').values(
+            'name', 'sku', 'units_sold'
+        )[:5]
+    
         product_stats = {
-            'total_inventory_value': float(total_inventory_value),
-            'low_stock_count': low_stock_count,
-            'out_of_stock_count': out_of_stock_count,
+            'total_inventory_value': inventory['total_inventory_value'],
+            'low_stock_count': inventory['low_stock_count'],
+            'out_of_stock_count': inventory['out_of_stock_count'],
             'monthly_stock_in': monthly_stock_in,
             'monthly_stock_out': abs(monthly_stock_out),
-            'top_selling_products': list(top_selling_products.values(
-                'name', 'sku', 'units_sold'
-            )),
+            'top_selling_products': list(top_selling_products),
         }
     
-    context = {
-        'widgets': widgets,
-        'notifications': notifications,
-        'quick_actions': quick_actions,
+    return {
         'recent_activities': recent_activities,
         'metrics': {
             'monthly_revenue': float(monthly_revenue),
@@ -205,6 +203,129 @@ def dashboard_home(request):
             'expense_change': expense_change,
         },
         'product_stats': product_stats,
+    }
+
+
+def _inventory_summary(products):
+    """
+    Product count, stock value and stock-level counts in one query
+
+    Stock levels are summed from the stock movements in SQL instead of
+    reading Product.current_stock (one aggregate query) per product.
+    Products out of stock are not also counted as low or overstocked.
+    """
+    in_stock = Q(stock_level__gt=0)
+    return products.annotate(
+        stock_level=Coalesce(Sum('stock_movements__quantity_change'), 0)
+    ).aggregate(
+        total_products=Count('id'),
+        # Cast in SQL so callers get a float without converting the Decimal
+        total_inventory_value=Coalesce(
+            Cast(Sum(F('stock_level') * F('cost_price'), output_field=DecimalField()), FloatField()),
+            0.0
+        ),
+        out_of_stock_count=Count('id', filter=Q(stock_level__lte=0)),
+        low_stock_count=Count(
+            'id', filter=in_stock & Q(stock_level__lte=F('reorder_point'))
+        ),
+        overstocked_count=Count(
+            'id',
+            filter=in_stock & Q(stock_level__gt=F('reorder_point'))
+            & Q(stock_level__gt=F('maximum_stock_level'))
+        ),
+    )
+
+
+def _stock_flow(movements):
+    """
+    Units moved in and out by ``movements``, from one aggregate query
+
+    Returns:
+        tuple: (stock in, stock out); stock out is zero or negative
+    """
+    totals = movements.aggregate(
+        stock_in=Sum('quantity_change', filter=Q(quantity_change__gt=0)),
+        stock_out=Sum('quantity_change', filter=Q(quantity_change__lt=0)),
+    )
+    return totals['stock_in'] or 0, totals['stock_out'] or 0
+
+
+def _chart_window(request):
+    """Days requested and the (start, end) dates they cover, ending today"""
+    days = int(request.GET.get('days', 30))
+    end_date = timezone.now().date()
+    return days, end_date - timedelta(days=days), end_date
+
+
+def _paid_invoices_in_window(request):
+    """The user's paid invoices within the revenue chart window"""
+    _days, start_date, end_date = _chart_window(request)
+    return Invoice.objects.filter(
+        user=request.user,
+        status='paid',
+        date_created__gte=start_date,
+        date_created__lte=end_date
+    )
+
+
+def _expenses_in_window(request):
+    """The user's expenses within the expense chart window"""
+    _days, start_date, end_date = _chart_window(request)
+    return Expense.objects.filter(
+        user=request.user,
+        date__gte=start_date,
+        date__lte=end_date
+    )
+
+
+def _chart_etag(request, queryset):
+    """
+    ETag for a chart built from ``queryset``
+
+    Combines the window with the row count and latest update of the rows,
+    so adding, editing or deleting a charted row (or a new day) changes it,
+    while an unchanged chart costs one small aggregate instead of the
+    grouped daily query.
+    """
+    days, _start_date, end_date = _chart_window(request)
+    state = queryset.aggregate(rows=Count('id'), last_change=Max('updated_at'))
+    last_change = state['last_change'].timestamp() if state['last_change'] else 0
+    return f'{days}:{end_date.isoformat()}:{state["rows"]}:{last_change}'
+
+
+@login_required
+def dashboard_home(request):
+    """
+    Main dashboard view with customizable widgets
+    Much more flexible than QuickBooks' static dashboard
+    """
+    # Get user's dashboard widgets and quick actions (cached until customized)
+    widgets, quick_actions = get_dashboard_layout(request.user.id)
+    
+    # Get recent notifications
+    notifications = Notification.objects.filter(
+        user=request.user, 
+        is_read=False
+    ).only(*DASHBOARD_NOTIFICATION_FIELDS).order_by('-created_at')[:5]
+    
+    # Calculate key metrics with company context; cached for the month and
+    # expired when the company's (or user's) invoices, expenses, customers,
+    # products or stock movements change
+    today = timezone.now().date()
+    company = getattr(request, 'company', None)
+    dashboard_data = cache.get_or_set(
+        dashboard_metrics_cache_key(
+            request.user.id, company.id if company else None, today.replace(day=1)
+        ),
+        lambda: _compute_metrics(request.user, company, today),
+        DASHBOARD_METRICS_TTL
+    )
+    
+    context = {
+        'widgets': widgets,
+        'notifications': notifications,
+        'quick_actions': quick_actions,
+        **dashboard_data,
         'today': today,
     }
     
@@ -214,24 +335,10 @@ def dashboard_home(request):
 @login_required
 def export_dashboard_data(request):
     """Export dashboard data to CSV"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="dashboard_data.csv"'
-    
-    writer = csv.writer(response)
     company = getattr(request, 'company', None)
     
-    # Write headers
-    writer.writerow(['Export Date', timezone.now().strftime('%Y-%m-%d %H:%M:%S')])
-    writer.writerow(['Company', company.name if company else 'Personal'])
-    writer.writerow([])  # Empty row
-    
     # Base querysets
-    if company:
-        invoice_qs = Invoice.objects.filter(company=company)
-        expense_qs = Expense.objects.filter(company=company)
-    else:
-        invoice_qs = Invoice.objects.filter(user=request.user)
-        expense_qs = Expense.objects.filter(user=request.user)
+    invoice_qs, expense_qs, _, _ = scoped_querysets(request.user, company)
     
     # Summary metrics
     today = timezone.now().date()
@@ -246,40 +353,57 @@ def export_dashboard_data(request):
         date__gte=month_start
     ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
     
-    writer.writerow(['Monthly Summary'])
-    writer.writerow(['Revenue', f'${monthly_revenue}'])
-    writer.writerow(['Expenses', f'${monthly_expenses}'])
-    writer.writerow(['Net Income', f'${monthly_revenue - monthly_expenses}'])
-    writer.writerow([])
-    
-    # Recent Invoices
-    writer.writerow(['Recent Invoices'])
-    writer.writerow(['Invoice Number', 'Customer', 'Amount', 'Status', 'Date'])
-    
-    recent_invoices = invoice_qs.order_by('-date_created')[:20]
-    for invoice in recent_invoices:
-        writer.writerow([
-            invoice.invoice_number,
-            invoice.customer.name if invoice.customer else 'N/A',
-            f'${invoice.total_amount}',
-            invoice.get_status_display(),
-            invoice.date_created.strftime('%Y-%m-%d')
-        ])
-    
-    writer.writerow([])
-    
-    # Recent Expenses
-    writer.writerow(['Recent Expenses'])
-    writer.writerow(['Description', 'Category', 'Amount', 'Date'])
-    
-    recent_expenses = expense_qs.order_by('-date')[:20]
-    for expense in recent_expenses:
-        writer.writerow([
-            expense.description,
-            expense.category.name if expense.category else 'Uncategorized',
-            f'${expense.amount}',
-            expense.date.strftime('%Y-%m-%d')
-        ])
+    # Only the exported columns; invoices and expenses carry wide JSON/text fields
+    recent_invoices = invoice_qs.select_related('customer').only(
+        'invoice_number', 'customer__name', 'total_amount', 'status', 'date_created'
+    ).order_by('-date_created')[:20]
+    recent_expenses = expense_qs.select_related('category').only(
+        'description', 'category__name', 'amount', 'date'
+    ).order_by('-date')[:20]
+    exported_at = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def csv_rows():
+        writer = csv.writer(Echo())
+        
+        # Write headers
+        yield writer.writerow(['Export Date', exported_at])
+        yield writer.writerow(['Company', company.name if company else 'Personal'])
+        yield writer.writerow([])  # Empty row
+        
+        yield writer.writerow(['Monthly Summary'])
+        yield writer.writerow(['Revenue', f'${monthly_revenue}'])
+        yield writer.writerow(['Expenses', f'${monthly_expenses}'])
+        yield writer.writerow(['Net Income', f'${monthly_revenue - monthly_expenses}'])
+        yield writer.writerow([])
+        
+        # Recent Invoices
+        yield writer.writerow(['Recent Invoices'])
+        yield writer.writerow(['Invoice Number', 'Customer', 'Amount', 'Status', 'Date'])
+        for invoice in recent_invoices.iterator(chunk_size=500):
+            yield writer.writerow([
+                invoice.invoice_number,
+                invoice.customer.name if invoice.customer else 'N/A',
+                f'${invoice.total_amount}',
+                invoice.get_status_display(),
+                invoice.date_created.strftime('%Y-%m-%d')
+            ])
+        
+        yield writer.writerow([])
+        
+        # Recent Expenses
+        yield writer.writerow(['Recent Expenses'])
+        yield writer.writerow(['Description', 'Category', 'Amount', 'Date'])
+        for expense in recent_expenses.iterator(chunk_size=500):
+            yield writer.writerow([
+                expense.description,
+                expense.category.name if expense.category else 'Uncategorized',
+                f'${expense.amount}',
+                expense.date.strftime('%Y-%m-%d')
+            ])
+    
+    # Stream the CSV so the export is never held in memory
+    response = StreamingHttpResponse(csv_rows(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="dashboard_data.csv"'
     
     return response
 
@@ -288,82 +412,69 @@ def export_dashboard_data(request):
 def get_recent_activity(request):
     """AJAX endpoint for recent activity"""
     company = getattr(request, 'company', None)
+    invoice_qs, expense_qs, _, _ = scoped_querysets(request.user, company)
     
-    if company:
-        invoice_qs = Invoice.objects.filter(company=company)
-        expense_qs = Expense.objects.filter(company=company)
-    else:
-        invoice_qs = Invoice.objects.filter(user=request.user)
-        expense_qs = Expense.objects.filter(user=request.user)
-    
+    now = timezone.now()
+    midnight = datetime.min.time()
+    current_tz = timezone.get_current_timezone()
     activities = []
-    
-    # Recent invoices
-    recent_invoices = invoice_qs.order_by('-date_created')[:10]
-    for invoice in recent_invoices:
-        # Convert date to datetime for naturaltime compatibility
-        invoice_datetime = timezone.make_aware(datetime.combine(invoice.date_created, datetime.min.time()))
-        activities.append({
-            'type': 'invoice',
-            'icon': 'fas fa-file-invoice',
-            'color': 'green' if invoice.status == 'paid' else 'blue',
-            'title': f'Invoice #{invoice.invoice_number}',
-            'description': f'Created for {invoice.customer.name}' if invoice.customer else 'Created',
-            'amount': str(invoice.total_amount),
-            'date': invoice.date_created.isoformat(),
-            'url': f'/invoicing/invoices/{invoice.id}/',
-            'time_ago': naturaltime(invoice_datetime)
-        })
-    
-    # Recent expenses
-    recent_expenses = expense_qs.order_by('-date')[:10]
-    for expense in recent_expenses:
-        activities.append({
-            'type': 'expense',
-            'icon': 'fas fa-receipt',
-            'color': 'red',
-            'title': expense.description[:50],
-            'description': 'Expense recorded',
-            'amount': str(expense.amount),
-            'date': expense.date.isoformat(),
-            'url': f'/expenses/{expense.id}/',
-            'time_ago': naturaltime(timezone.make_aware(datetime.combine(expense.date, datetime.min.time())))
-        })
-    
-    # Sort by date
-    activities.sort(key=lambda x: x['date'], reverse=True)
-    
-    return JsonResponse({'activities': activities[:15]})
+    for row in _recent_activity_rows(invoice_qs, expense_qs, 15):
+        # Dates count from midnight, as naturaltime did
+        activity_datetime = datetime.combine(row['activity_date'], midnight, tzinfo=current_tz)
+        time_ago = _time_ago(now - activity_datetime)
+        if row['kind'] == 'invoice':
+            activities.append({
+                'type': 'invoice',
+                'icon': 'fas fa-file-invoice',
+                'color': 'green' if row['status_code'] == 'paid' else 'blue',
+                'title': f'Invoice #{row["label"]}',
+                'description': f'Created for {row["customer_name"]}' if row['customer_name'] else 'Created',
+                'amount': row['activity_amount'],
+                'date': row['activity_date'].isoformat(),
+                'url': f'/invoicing/invoices/{row["activity_id"]}/',
+                'time_ago': time_ago
+            })
+        else:
+            activities.append({
+                'type': 'expense',
+                'icon': 'fas fa-receipt',
+                'color': 'red',
+                'title': row['label'][:50],
+                'description': 'Expense recorded',
+                'amount': row['activity_amount'],
+                'date': row['activity_date'].isoformat(),
+                'url': f'/expenses/{row["activity_id"]}/',
+                'time_ago': time_ago
+            })
+    
+    return fast_json_response({'activities': activities})
 
 
 @login_required
+@condition(etag_func=lambda request: _chart_etag(request, _paid_invoices_in_window(request)))
 def get_revenue_chart_data(request):
     """
     API endpoint for revenue chart data
     Real-time data vs QuickBooks' delayed updates
     """
-    days = int(request.GET.get('days', 30))
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=days)
+    days, start_date, end_date = _chart_window(request)
+    
+    # Get daily revenue data in one grouped query; days without sales stay at 0
+    revenue_by_day = dict(
+        _paid_invoices_in_window(request).order_by().values('date_created').annotate(
+            total=Sum('total_amount')
+        ).values_list('date_created', 'total')
+    )
     
-    # Get daily revenue data
     daily_revenue = []
-    current_date = start_date
-    
-    while current_date <= end_date:
-        revenue = Invoice.objects.filter(
-            user=request.user,
-            date_created=current_date,
-            status='paid'
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        
+    for offset in range(days + 1):
+        current_date = start_date + timedelta(days=offset)
         daily_revenue.append({
             'date': current_date.strftime('%Y-%m-%d'),
-            'revenue': float(revenue)
+            'revenue': float(revenue_by_day.get(current_date, 0))
         })
-        current_date += timedelta(days=1)
     
-    return JsonResponse({'data': daily_revenue})
+    return fast_json_response({'data': daily_revenue})
 
 
 @login_required
@@ -373,67 +484,37 @@ def get_product_stats(request):
     """
     company = getattr(request, 'company', None)
     if not company:
-        return JsonResponse({'error': 'No active company'}, status=400)
+        return fast_json_response({'error': 'No active company'}, status=400)
     
     from inventory.models import Product, StockMovement
     
-    # Calculate product statistics
+    # Calculate product statistics, inventory value and stock levels
     active_products = Product.objects.filter(company=company, is_active=True)
-    total_products = active_products.count()
-    
-    # Calculate inventory value and stock levels
-    total_inventory_value = Decimal('0.00')
-    low_stock_count = 0
-    out_of_stock_count = 0
-    overstocked_count = 0
-    
-    for product in active_products:
-        current_stock = product.current_stock
-        stock_value = current_stock * product.cost_price
-        total_inventory_value += stock_value
-        
-        if current_stock <= 0:
-            out_of_stock_count += 1
-        elif current_stock <= product.reorder_point:
-            low_stock_count += 1
-        elif current_stock > product.maximum_stock_level:
-            overstocked_count += 1
+    inventory = _inventory_summary(active_products)
     
     # Recent stock movements
     today = timezone.now().date()
     week_start = today - timedelta(days=7)
     month_start = today.replace(day=1)
     
-    weekly_movements = StockMovement.objects.filter(
-        company=company,
-        movement_date__gte=week_start
-    )
-    
-    monthly_movements = StockMovement.objects.filter(
-        company=company,
-        movement_date__gte=month_start
+    # Stock in/out statistics for both periods in one aggregate; early in
+    # the month the week starts before the month does
+    stock_in, stock_out = Q(quantity_change__gt=0), Q(quantity_change__lt=0)
+    in_week, in_month = Q(movement_date__gte=week_start), Q(movement_date__gte=month_start)
+    flow = StockMovement.objects.filter(
+        company=company, movement_date__gte=min(week_start, month_start)
+    ).aggregate(
+        weekly_stock_in=Sum('quantity_change', filter=in_week & stock_in),
+        weekly_stock_out=Sum('quantity_change', filter=in_week & stock_out),
+        monthly_stock_in=Sum('quantity_change', filter=in_month & stock_in),
+        monthly_stock_out=Sum('quantity_change', filter=in_month & stock_out),
     )
     
-    # Stock in/out statistics
-    weekly_stock_in = weekly_movements.filter(
-        quantity_change__gt=0
-    ).aggregate(total=Sum('quantity_change'))['total'] or 0
-    
-    weekly_stock_out = weekly_movements.filter(
-        quantity_change__lt=0
-    ).aggregate(total=Sum('quantity_change'))['total'] or 0
-    
-    monthly_stock_in = monthly_movements.filter(
-        quantity_change__gt=0
-    ).aggregate(total=Sum('quantity_change'))['total'] or 0
-    
-    monthly_stock_out = monthly_movements.filter(
-        quantity_change__lt=0
-    ).aggregate(total=Sum('quantity_change'))['total'] or 0
-    
     # Top products by value and movement
     top_value_products = active_products.annotate(
-        stock_value=F('cost_price') * Sum('stock_movements__quantity_change')
+        stock_value=Cast(
+            F('cost_price') * Sum('stock_movements__quantity_change'), FloatField()
+        )
     ).order_by('-stock_value')[:5]
     
     # Most active products (by movement frequency)
@@ -454,17 +535,17 @@ def get_product_stats(request):
     
     data = {
         'overview': {
-            'total_products': total_products,
-            'total_inventory_value': float(total_inventory_value),
-            'low_stock_count': low_stock_count,
-            'out_of_stock_count': out_of_stock_count,
-            'overstocked_count': overstocked_count,
+            'total_products': inventory['total_products'],
+            'total_inventory_value': inventory['total_inventory_value'],
+            'low_stock_count': inventory['low_stock_count'],
+            'out_of_stock_count': inventory['out_of_stock_count'],
+            'overstocked_count': inventory['overstocked_count'],
         },
         'movements': {
-            'weekly_stock_in': weekly_stock_in,
-            'weekly_stock_out': abs(weekly_stock_out),
-            'monthly_stock_in': monthly_stock_in,
-            'monthly_stock_out': abs(monthly_stock_out),
+            'weekly_stock_in': flow['weekly_stock_in'] or 0,
+            'weekly_stock_out': abs(flow['weekly_stock_out'] or 0),
+            'monthly_stock_in': flow['monthly_stock_in'] or 0,
+            'monthly_stock_out': abs(flow['monthly_stock_out'] or 0),
         },
         'top_products': {
             'by_value': list(top_value_products.values(
@@ -481,35 +562,33 @@ def get_product_stats(request):
         }
     }
     
-    return JsonResponse(data)
+    return fast_json_response(data)
 
 
 @login_required
+@condition(etag_func=lambda request: _chart_etag(request, _expenses_in_window(request)))
 def get_expense_chart_data(request):
     """
     API endpoint for expense chart data
     """
-    days = int(request.GET.get('days', 30))
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=days)
+    days, start_date, end_date = _chart_window(request)
     
-    # Get daily expense data
-    daily_expenses = []
-    current_date = start_date
+    # Get daily expense data in one grouped query; days without expenses stay at 0
+    expenses_by_day = dict(
+        _expenses_in_window(request).order_by().values('date').annotate(
+            total=Sum('amount')
+        ).values_list('date', 'total')
+    )
     
-    while current_date <= end_date:
-        expenses = Expense.objects.filter(
-            user=request.user,
-            date=current_date
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
+    daily_expenses = []
+    for offset in range(days + 1):
+        current_date = start_date + timedelta(days=offset)
         daily_expenses.append({
             'date': current_date.strftime('%Y-%m-%d'),
-            'expenses': float(expenses)
+            'expenses': float(expenses_by_day.get(current_date, 0))
         })
-        current_date += timedelta(days=1)
     
-    return JsonResponse({'data': daily_expenses})
+    return fast_json_response({'data': daily_expenses})
 
 
 @login_required
@@ -517,18 +596,15 @@ def mark_notification_read(request, notification_id):
     """
     Mark a notification as read
     """
-    try:
-        notification = Notification.objects.get(
-            id=notification_id, 
-            user=request.user
-        )
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save()
-        
-        return JsonResponse({'success': True})
-    except Notification.DoesNotExist:
+    # Single UPDATE; the row count tells whether the notification exists
+    updated = Notification.objects.filter(
+        id=notification_id, 
+        user=request.user
+    ).update(is_read=True, read_at=timezone.now())
+    
+    if not updated:
         return JsonResponse({'success': False, 'error': 'Notification not found'})
+    return JsonResponse({'success': True})
 
 
 @login_required
@@ -540,11 +616,28 @@ def customize_dashboard(request):
     widgets = DashboardWidget.objects.filter(user=request.user)
     
     if request.method == 'POST':
-        # Handle widget updates
-        widget_data = request.POST.get('widgets')
-        # Process widget position updates
-        # This would handle the drag-and-drop widget positioning
-        pass
+        # Handle the drag-and-drop widget positioning
+        try:
+            layout = {
+                int(item['id']): {
+                    field: int(item[field]) for field in WIDGET_LAYOUT_FIELDS if field in item
+                }
+                for item in json.loads(request.POST.get('widgets', '[]'))
+            }
+        except (ValueError, TypeError, KeyError):
+            return JsonResponse({'success': False, 'error': 'Invalid widget layout'}, status=400)
+        
+        with transaction.atomic():
+            changed = list(widgets.filter(id__in=layout))
+            for widget in changed:
+                for field, value in layout[widget.id].items():
+                    setattr(widget, field, value)
+            # One batched UPDATE instead of a save() per widget
+            DashboardWidget.objects.bulk_update(changed, WIDGET_LAYOUT_FIELDS, batch_size=100)
+            # bulk_update sends no post_save, so drop the cached layout here
+            transaction.on_commit(lambda: cache.delete(dashboard_layout_cache_key(request.user.id)))
+        
+        return JsonResponse({'success': True, 'updated': len(changed)})
     
     context = {
         'widgets': widgets,
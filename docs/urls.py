@@ -8,17 +8,18 @@ app_name = 'docs'
 
 urlpatterns = [
     path('', views.documentation_home, name='home'),
-    path('getting-started/', views.getting_started, name='getting_started'),
-    path('dashboard/', views.dashboard_docs, name='dashboard'),
-    path('invoicing/', views.invoicing_docs, name='invoicing'),
-    path('expenses/', views.expenses_docs, name='expenses'),
-    path('inventory/', views.inventory_docs, name='inventory'),
-    path('hr/', views.hr_docs, name='hr'),
-    path('ai-insights/', views.ai_insights_docs, name='ai_insights'),
-    path('bank-reconciliation/', views.bank_reconciliation_docs, name='bank_reconciliation'),
-    path('reports/', views.reports_docs, name='reports'),
-    path('sales/', views.sales_docs, name='sales'),
-    path('accounts/', views.accounts_docs, name='accounts'),
-    path('api/', views.api_docs, name='api'),
-    path('troubleshooting/', views.troubleshooting, name='troubleshooting'),
+    # Every section is served by doc_page; the URL names stay per section
+    path('getting-started/', views.doc_page, {'section': 'getting_started'}, name='getting_started'),
+    path('dashboard/', views.doc_page, {'section': 'dashboard'}, name='dashboard'),
+    path('invoicing/', views.doc_page, {'section': 'invoicing'}, name='invoicing'),
+    path('expenses/', views.doc_page, {'section': 'expenses'}, name='expenses'),
+    path('inventory/', views.doc_page, {'section': 'inventory'}, name='inventory'),
+    path('hr/', views.doc_page, {'section': 'hr'}, name='hr'),
+    path('ai-insights/', views.doc_page, {'section': 'ai_insights'}, name='ai_insights'),
+    path('bank-reconciliation/', views.doc_page, {'section': 'bank_reconciliation'}, name='bank_reconciliation'),
+    path('reports/', views.doc_page, {'section': 'reports'}, name='reports'),
+    path('sales/', views.doc_page, {'section': 'sales'}, name='sales'),
+    path('accounts/', views.doc_page, {'section': 'accounts'}, name='accounts'),
+    path('api/', views.doc_page, {'section': 'api'}, name='api'),
+    path('troubleshooting/', views.doc_page, {'section': 'troubleshooting'}, name='troubleshooting'),
 ]
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from common.email_utils import queue_bulk_invoice_reminders
+
+
+class Command(BaseCommand):
+    help = 'Send payment reminders for all overdue invoices (run daily, e.g. from cron)'
+
+    def handle(self, *args, **kwargs):
+        result = queue_bulk_invoice_reminders()
+        if 'queued' in result:
+            self.stdout.write(self.style.SUCCESS(f"Queued {result['queued']} invoice reminders"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Sent {result['sent']} invoice reminders, {result['failed']} failed"
+            ))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoicing', '0004_alter_customer_currency'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['user', 'status', 'date_created'], name='inv_user_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoicing', '0005_invoice_user_status_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['company', 'status'], name='inv_company_status_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoicing', '0007_invoice_company_status_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['company', 'date_created', 'status'], name='inv_company_created_status_idx'),
+        ),
+    ]
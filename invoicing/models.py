@@ -215,6 +215,14 @@ class Invoice(models.Model):
 
     class Meta:
         ordering = ['-date_created']
+        indexes = [
+            # Daily revenue chart: paid invoices per user over a date range
+            models.Index(fields=['user', 'status', 'date_created'], name='inv_user_status_created_idx'),
+            # Outstanding invoices on the dashboard, scoped to a company
+            models.Index(fields=['company', 'status'], name='inv_company_status_idx'),
+            # Company revenue aggregates and charts over a date range
+            models.Index(fields=['company', 'date_created', 'status'], name='inv_company_created_status_idx'),
+        ]
 
 
 class InvoiceItem(models.Model):